@@ -1,32 +1,97 @@
-__import__('pysqlite3')
-import sys
-sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
-
-from fastapi import FastAPI, BackgroundTasks
-from pydantic import BaseModel
-import asyncio
-import random
-import json
-import uuid
-import chromadb
-from datetime import datetime
-
-from app.core.orchestrator import OmegaOrchestrator
-from app.agents.oracle_agent import create_oracle_agent
-from crewai import Task, Crew
+import os
+import threading
+from app.core.startup_profile import StartupProfiler
+
+# ==========================================
+# ⚡ FAST-START MODE
+# ==========================================
+# OMEGA_FAST_START=1 (default): the physics engine and /telemetry come up first, the ML cortex trains on a
+# background thread, and the agent/RAG stacks (crewai, chromadb, sentence-transformers) load on first use.
+# OMEGA_FAST_START=0 restores the eager boot (cortex trained before the app object is importable).
+FAST_START = os.getenv("OMEGA_FAST_START", "1") == "1"
+profiler = StartupProfiler(budget_s=float(os.getenv("OMEGA_STARTUP_BUDGET_S", "2.0")))
+
+with profiler.phase("core_imports"):
+    from fastapi import FastAPI, HTTPException, Query, Request, Response
+    from pydantic import BaseModel, Field
+    import asyncio
+    import random
+    import json
+    import uuid
+    from datetime import datetime
+
+    from app.core.orchestrator import OmegaOrchestrator
+    from app.core.grid_tenancy import DEFAULT_GRID
+    from app.core.analysis_queue import AnalysisJobQueue, AnalysisQueueFull
+    from app.core.approval_broker import ApprovalBroker
+    from app.core.checkpoint import CheckpointManager
+    from app.core.telemetry_ingest import TelemetryIngestor, source_from_uri
+    from app.core.telemetry_frame import FRAME_MEDIA_TYPE, encode_telemetry_frame
+    from app.core.grid_analytics import tile_heatmap, region_latency_quantiles, node_page, to_json_ready
+    from app.memory.memory_service import get_memory_service
+    from app.agents.response_cache import canonical_signature, get_response_cache
+    from app.agents.telemetry_summarizer import summarize_telemetry
 
 app = FastAPI(title="City Connect Omega: Prime Command Center")
-orch = OmegaOrchestrator()
+with profiler.phase("orchestrator_init"):
+    # Flagged agent actions wait here for an API/dashboard decision; unanswered ones fall back to the default
+    approvals = ApprovalBroker(
+        default_timeout_s=float(os.getenv("OMEGA_APPROVAL_TIMEOUT_S", "300")),
+        approve_on_timeout=os.getenv("OMEGA_APPROVAL_TIMEOUT_DEFAULT", "VETO") == "APPROVE"
+    )
+    # Training waits until after checkpoint restore, which usually brings the trained weights back
+    orch = OmegaOrchestrator(pretrain=False, approvals=approvals,
+                             grid_workers=int(os.getenv("OMEGA_GRID_WORKERS", "4")))
+    orch.default.tick_interval_s = float(os.getenv("OMEGA_TICK_INTERVAL_S", "0.5"))
+
+# ==========================================
+# 🏙️ GRID TENANCY
+# ==========================================
+# Extra districts/customers share this process's cortex, agents and vector memory. Each has its own tick
+# rate and routing state. Boot-time grids: OMEGA_GRIDS="north:800:1.0,south:500" (id:nodes[:tick_interval_s]).
+# Grids are fully connected (O(n^2) links), so tenant size is capped; tenants are included in checkpoints.
+SCHEDULER_POLL_S = float(os.getenv("OMEGA_SCHEDULER_POLL_S", "0.05"))
+MAX_GRID_NODES = int(os.getenv("OMEGA_MAX_GRID_NODES", "1000"))
+for spec in filter(None, (s.strip() for s in os.getenv("OMEGA_GRIDS", "").split(","))):
+    grid_id, num_nodes, *interval = spec.split(":")
+    if not 1 <= int(num_nodes) <= MAX_GRID_NODES:
+        raise ValueError(f"OMEGA_GRIDS: grid '{grid_id}' needs 1..{MAX_GRID_NODES} nodes (OMEGA_MAX_GRID_NODES).")
+    orch.add_grid(grid_id, num_nodes=int(num_nodes), tick_interval_s=float(interval[0]) if interval else 0.5)
+    print(f"[SYSTEM] Hosting grid '{grid_id}' ({num_nodes} nodes).")
 
 # ==========================================
 # 🧠 VECTOR MEMORY CORTEX (AUTO-LEARNING)
 # ==========================================
-try:
-    chroma_client = chromadb.PersistentClient(path="./omega_memory")
-    memory_collection = chroma_client.get_or_create_collection(name="threat_signatures")
-    print("[SYSTEM] Vector Memory Cortex successfully linked to API API Backend.")
-except Exception as e:
-    print(f"[ERROR] Failed to link Vector Memory: {e}")
+# One shared client for the API and the agents; it connects and loads the embedding model in the background
+memory_service = get_memory_service()
+# Learned memories stay bounded: near-duplicate signatures are merged (with hit counts) and the least-used
+# entries above OMEGA_MEMORY_MAX_ENTRIES are evicted every OMEGA_MEMORY_COMPACT_INTERVAL_S (0 disables)
+memory_service.merge_distance = float(os.getenv("OMEGA_MEMORY_MERGE_DISTANCE", "0.06"))
+memory_service.max_entries = int(os.getenv("OMEGA_MEMORY_MAX_ENTRIES", "500"))
+MEMORY_COMPACT_INTERVAL_S = float(os.getenv("OMEGA_MEMORY_COMPACT_INTERVAL_S", "600"))
+
+# Repeat incidents (same quantized anomaly signature) are answered from here instead of the LLM
+response_cache = get_response_cache()
+
+# ==========================================
+# 🤖 AGENT STACK (LOADED ON FIRST USE)
+# ==========================================
+_agent_stack = None
+_agent_stack_lock = threading.Lock()
+
+def load_agent_stack():
+    """Imports crewai and the Oracle the first time intelligence is requested, binding it to the live grid."""
+    global _agent_stack
+    with _agent_stack_lock:
+        if _agent_stack is None:
+            with profiler.phase("agent_stack_import"):
+                from app.agents.oracle_agent import create_oracle_agent, attach_grid
+                from app.agents.executive_agent import attach_governance
+                from crewai import Task, Crew
+                attach_grid(orch.grid, orch.ml_cortex)  # The Oracle's sensory tool reads the live engine grid
+                attach_governance(orch.governance, neutralize_node)  # Executive vetoes go to the approval broker
+                _agent_stack = (create_oracle_agent, Task, Crew)
+    return _agent_stack
 
 # ==========================================
 # 🌐 CENTRAL SYSTEM STATE
@@ -35,11 +100,45 @@ system_state = {
     "ai_status": "IDLE",
     "ai_report": "",
     "pending_action": None,
-    "logs": ["SYSTEM: Core initialized. ML Predictive Cortex online."],
+    "logs": ["SYSTEM: Core initialized." + ("" if FAST_START else " ML Predictive Cortex online.")],
     "last_anomaly_signature": "", # Stores the exact telemetry math of the active attack
-    "last_recommended_action": "" # Stores the approved countermeasure for learning
+    "last_recommended_action": "", # Stores the approved countermeasure for learning
+    "active_job_id": None # Analysis job the dashboard is currently waiting on
 }
 
+# ==========================================
+# ♻️ CHECKPOINTS (WARM RESTARTS)
+# ==========================================
+# Grid, pheromones, cortex weights and system_state are snapshotted every OMEGA_CHECKPOINT_INTERVAL_S
+# (0 disables) and restored on boot (OMEGA_RESTORE=1), so a restart resumes instead of retraining.
+# OMEGA_CHECKPOINT_DIR must only be writable by the engine: restored cortex weights are unpickled.
+CHECKPOINT_INTERVAL_S = float(os.getenv("OMEGA_CHECKPOINT_INTERVAL_S", "30"))
+checkpoints = CheckpointManager(orch, root=os.getenv("OMEGA_CHECKPOINT_DIR", "./omega_checkpoints"), state=system_state)
+if os.getenv("OMEGA_RESTORE", "1") == "1":
+    with profiler.phase("checkpoint_restore"):
+        # Grid and pheromones come back now; the cortex weights are unpickled on the warm-up thread
+        if checkpoints.restore(defer_model=FAST_START):
+            # Analysis jobs do not survive a restart; an incident that was mid-analysis goes back to IDLE
+            if system_state.get("ai_status") == "THINKING":
+                system_state["ai_status"] = "IDLE"
+            system_state["active_job_id"] = None
+            system_state["logs"].append(f"SYSTEM: Warm restart from checkpoint (tick {orch.ticks}).")
+if not FAST_START and not orch.ml_cortex.is_trained:
+    with profiler.phase("ml_cortex_training"):
+        orch.ml_cortex.train_baseline()
+
+# ==========================================
+# 📥 EXTERNAL TELEMETRY INGESTION
+# ==========================================
+# OMEGA_INGEST_SOURCE=kafka://broker:9092/topic | file:///path/feed.ndjson | tcp://0.0.0.0:9500
+# Batches are applied to the live grid between physics ticks and scored by the cortex as they land.
+INGEST_SOURCE = os.getenv("OMEGA_INGEST_SOURCE", "")
+ingestor = TelemetryIngestor(
+    orch.grid, orch.ml_cortex,
+    num_workers=int(os.getenv("OMEGA_INGEST_WORKERS", "4")),
+    queue_batches=int(os.getenv("OMEGA_INGEST_QUEUE_BATCHES", "64"))
+)
+
 def log_event(event_type: str, details: dict | str):
     """Saves a timestamped scientific audit log."""
     log_entry = {
@@ -50,80 +149,415 @@ def log_event(event_type: str, details: dict | str):
     with open("session_log.json", "a") as f:
         f.write(json.dumps(log_entry) + "\n")
 
+def background_warm_up():
+    """Off the serving path: load restored cortex weights or train the cortex (fast-start only), then warm the vector memory."""
+    if checkpoints.pending_model is not None:
+        with profiler.phase("checkpoint_model_restore"):
+            checkpoints.restore_model()
+        system_state["logs"].append("SYSTEM: ML Predictive Cortex restored from checkpoint.")
+    if not orch.ml_cortex.is_trained:
+        with profiler.phase("ml_cortex_training"):
+            orch.ml_cortex.train_baseline()
+        system_state["logs"].append("SYSTEM: ML Predictive Cortex online.")
+    with profiler.phase("vector_memory_warmup"):
+        memory_service.warm_up()
+    if MEMORY_COMPACT_INTERVAL_S > 0:
+        memory_service.start_maintenance(MEMORY_COMPACT_INTERVAL_S)
+    log_event("STARTUP_PROFILE", profiler.report())
+
+def neutralize_node(action_name: str, target_node: int):
+    """Applies an authorized Executive action to the live grid."""
+    # Also drops the node's attack baseline, so it recovers its pre-attack readings and rejoins the contagion model
+    with orch.grid.lock:
+        orch.grid.clear_anomaly(target_node)
+    system_state["logs"].append(f"CMD: {action_name} executed on Node {target_node}.")
+
+def record_approval_decision(approval: dict):
+    system_state["logs"].append(f"CMD: Approval {approval['id']} ({approval['action']}) {approval['status']} by {approval['decided_by']}.")
+    log_event("APPROVAL_DECISION", approval)
+
+approvals.subscribe(record_approval_decision)
+
+# Called with (telemetry, alerts) after every engine tick; the multi-worker engine host publishes snapshots here
+tick_listeners = []
+
 @app.on_event("startup")
 async def start_physics():
     log_event("SYSTEM_BOOT", "Physics engine and ML cortex started.")
     async def run_engine():
+        last_checkpoint = asyncio.get_running_loop().time()
         while True:
-            orch.run_cycle()
-            await asyncio.sleep(0.5)
+            # Every due grid ticks on the worker pool; all of them are scored in one cortex batch
+            ticked = await asyncio.to_thread(orch.run_due_grids)
+            if DEFAULT_GRID in ticked:
+                telemetry, alerts = ticked[DEFAULT_GRID]
+                for listener in tick_listeners:
+                    listener(telemetry, alerts)
+            # Tick boundary: exporting large grids walks every node and edge under the grid lock,
+            # so the capture runs off the event loop (the write happens on the checkpoint thread)
+            now = asyncio.get_running_loop().time()
+            if CHECKPOINT_INTERVAL_S > 0 and now - last_checkpoint >= CHECKPOINT_INTERVAL_S:
+                await asyncio.to_thread(checkpoints.capture)
+                last_checkpoint = now
+            await asyncio.sleep(SCHEDULER_POLL_S)
     asyncio.create_task(run_engine())
+    ingestor.start(source_from_uri(INGEST_SOURCE) if INGEST_SOURCE else None)
+    profiler.mark("serving")
+    print(f"[SYSTEM] Serving telemetry {profiler.report()['milestones']['serving']}s after boot.")
+    threading.Thread(target=background_warm_up, name="omega-warmup", daemon=True).start()
+
+@app.on_event("shutdown")
+def final_checkpoint():
+    ingestor.stop()
+    memory_service.stop_maintenance()
+    orch.close()
+    if CHECKPOINT_INTERVAL_S > 0:
+        checkpoints.checkpoint_now(timeout=10.0)
+
+@app.get("/checkpoint")
+async def get_checkpoint():
+    """The latest completed checkpoint (slot, tick, size)."""
+    return {"latest": checkpoints.last_written, "interval_s": CHECKPOINT_INTERVAL_S}
+
+@app.post("/checkpoint")
+async def trigger_checkpoint():
+    """Writes a checkpoint now (waits for it off the event loop)."""
+    return {"latest": await asyncio.to_thread(checkpoints.checkpoint_now, 10.0)}
+
+@app.get("/memory/stats")
+async def get_memory_stats():
+    """Vector memory size and the last compaction pass."""
+    if not memory_service.is_ready():
+        return {"ready": False, "last_compaction": memory_service.last_compaction}
+    count = await asyncio.to_thread(memory_service.collection.count)
+    return {"ready": True, "entries": count, "max_entries": memory_service.max_entries,
+            "merge_distance": memory_service.merge_distance, "last_compaction": memory_service.last_compaction}
+
+@app.post("/memory/compact")
+async def trigger_memory_compaction():
+    """Runs a compaction pass now (off the event loop)."""
+    if not memory_service.is_ready():
+        raise HTTPException(status_code=503, detail="Vector memory is still warming up.")
+    return await asyncio.to_thread(memory_service.compact)
+
+@app.get("/startup-profile")
+async def get_startup_profile():
+    """Boot phase timings, including background warm-up and the lazily imported agent stack."""
+    return profiler.report()
 
 @app.get("/telemetry")
-async def get_telemetry():
-    telemetry = orch.grid.fetch_live_telemetry()
-    alerts = [orch.ml_cortex.analyze_live_telemetry(n, d['telemetry']) 
-              for n, d in telemetry.items() if orch.ml_cortex.analyze_live_telemetry(n, d['telemetry'])['is_anomaly']]
-    return {"telemetry": telemetry, "alerts": alerts, "system": system_state}
+async def get_telemetry(request: Request):
+    # Alerts come from the last tick's batch scoring; no model call happens on the request path
+    alerts = orch.default.latest_alerts
+
+    # Columnar binary frame for clients that ask for it (skips the generic JSON encoder entirely)
+    if FRAME_MEDIA_TYPE in request.headers.get("accept", ""):
+        frame = encode_telemetry_frame(orch.snapshot(), meta={"alerts": alerts, "system": system_state})
+        return Response(content=frame, media_type=FRAME_MEDIA_TYPE)
+
+    return {"telemetry": orch.grid.fetch_live_telemetry(), "alerts": alerts, "system": system_state}
+
+@app.post("/ingest")
+async def ingest_batch(request: Request, partition: str = "http"):
+    """
+    Pushes one batch over HTTP: a telemetry frame body, or newline-delimited JSON messages.
+    Waits (off the event loop) while the partition's queue is full, so senders feel the backpressure.
+    """
+    body = await request.body()
+    messages = [body] if FRAME_MEDIA_TYPE in request.headers.get("content-type", "") else body.splitlines()
+    await asyncio.to_thread(ingestor.submit, partition, messages)
+    return {"queued": len(messages), "partition": partition}
+
+@app.get("/ingest/stats")
+async def get_ingest_stats():
+    return {"source": INGEST_SOURCE or None, "stats": ingestor.stats(), "recent_alerts": list(ingestor.recent_alerts)[-20:]}
+
+@app.get("/telemetry/history")
+async def get_telemetry_history(window_s: float = 900.0, resolution_s: float = 1.0, node_id: int | None = None):
+    """Range query over retained telemetry; served from the coarsest rollup tier that meets `resolution_s`."""
+    end = datetime.now().timestamp()
+    try:
+        df = orch.history.query(end - window_s, end, resolution_s=resolution_s, node_id=node_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"tier": df.attrs["tier"], "series": df.to_dict(orient="list")}
+
+# ==========================================
+# 📊 SERVER-SIDE AGGREGATION (LARGE GRIDS)
+# ==========================================
+@app.get("/analytics/heatmap")
+async def get_heatmap(tile_m: float = Query(100.0, gt=0)):
+    """Spatially binned tiles of the latest snapshot (counts, mean latency, max threat, compromised)."""
+    try:
+        return to_json_ready(tile_heatmap(orch.snapshot(), tile_m=tile_m, grid_size=orch.grid.grid_size))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/analytics/latency-quantiles")
+async def get_latency_quantiles(region_m: float = Query(250.0, gt=0)):
+    try:
+        return to_json_ready(region_latency_quantiles(orch.snapshot(), region_m=region_m, grid_size=orch.grid.grid_size))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/analytics/nodes")
+async def get_node_page(page: int = 0, page_size: int = 50, sort_by: str = "threat_level", descending: bool = True):
+    """Paginated, server-sorted node table."""
+    try:
+        return to_json_ready(node_page(orch.snapshot(), page=page, page_size=min(page_size, 500), sort_by=sort_by, descending=descending))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# ==========================================
+# 🏙️ GRID TENANCY ENDPOINTS
+# ==========================================
+# The un-prefixed endpoints above and below keep operating on the "default" grid
+class GridSpec(BaseModel):
+    grid_id: str
+    num_nodes: int = Field(5, ge=1, le=MAX_GRID_NODES)
+    tick_interval_s: float = Field(0.5, gt=0)
+    dt: float = Field(1.0, gt=0)
+
+def get_tenant(grid_id: str):
+    try:
+        return orch.tenant(grid_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown grid '{grid_id}'.")
+
+@app.get("/grids")
+async def list_grids():
+    return {"grids": orch.grid_status()}
+
+@app.post("/grids")
+async def create_grid(spec: GridSpec):
+    """Registers a new grid; it starts ticking on the next scheduler round and is kept in checkpoints from then on."""
+    try:
+        tenant = await asyncio.to_thread(orch.add_grid, spec.grid_id, spec.num_nodes, spec.tick_interval_s, spec.dt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    system_state["logs"].append(f"SYSTEM: Grid '{tenant.grid_id}' online ({tenant.grid.num_nodes} nodes).")
+    return dict(tenant.status(), persisted=CHECKPOINT_INTERVAL_S > 0)
+
+@app.delete("/grids/{grid_id}")
+async def delete_grid(grid_id: str):
+    get_tenant(grid_id)
+    try:
+        orch.remove_grid(grid_id)
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    system_state["logs"].append(f"SYSTEM: Grid '{grid_id}' decommissioned.")
+    return {"removed": grid_id}
+
+@app.get("/grids/{grid_id}")
+async def get_grid(grid_id: str):
+    tenant = get_tenant(grid_id)
+    return dict(tenant.status(), latest_alerts=tenant.latest_alerts)
+
+@app.get("/grids/{grid_id}/telemetry")
+async def get_grid_telemetry(grid_id: str, request: Request):
+    """Latest columnar snapshot of one grid (binary frame on request, otherwise JSON columns)."""
+    tenant = get_tenant(grid_id)
+    if FRAME_MEDIA_TYPE in request.headers.get("accept", ""):
+        frame = encode_telemetry_frame(tenant.snapshot(), meta={"grid_id": grid_id, "tick": tenant.ticks, "alerts": tenant.latest_alerts})
+        return Response(content=frame, media_type=FRAME_MEDIA_TYPE)
+    return {"grid_id": grid_id, "tick": tenant.ticks, "columns": to_json_ready(tenant.snapshot()), "alerts": tenant.latest_alerts}
+
+@app.get("/grids/{grid_id}/analytics/heatmap")
+async def get_grid_heatmap(grid_id: str, tile_m: float = Query(100.0, gt=0)):
+    tenant = get_tenant(grid_id)
+    try:
+        return to_json_ready(tile_heatmap(tenant.snapshot(), tile_m=tile_m, grid_size=tenant.grid.grid_size))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/grids/{grid_id}/analytics/nodes")
+async def get_grid_node_page(grid_id: str, page: int = 0, page_size: int = 50, sort_by: str = "threat_level", descending: bool = True):
+    tenant = get_tenant(grid_id)
+    try:
+        return to_json_ready(node_page(tenant.snapshot(), page=page, page_size=min(page_size, 500), sort_by=sort_by, descending=descending))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/grids/{grid_id}/trigger-random-attack")
+async def grid_random_attack(grid_id: str):
+    tenant = get_tenant(grid_id)
+    target = random.randint(0, tenant.grid.num_nodes - 1)
+    with tenant.grid.lock:
+        tenant.grid.inject_anomaly(target, "DDoS_ATTACK")
+    system_state["logs"].append(f"ALARM: Adversarial vector detected at Node {target} (grid '{grid_id}')")
+    log_event("ATTACK_INJECTED", {"grid_id": grid_id, "target_node": target, "type": "DDoS_ATTACK"})
+    return {"grid_id": grid_id, "target": target}
+
+@app.post("/grids/{grid_id}/route")
+async def route_grid_asset(grid_id: str, start: int, target: int, iterations: int = 20):
+    """Swarm route on one grid, using (and reinforcing) that grid's own pheromone trails."""
+    tenant = get_tenant(grid_id)
+    if not (0 <= start < tenant.grid.num_nodes and 0 <= target < tenant.grid.num_nodes):
+        raise HTTPException(status_code=400, detail="start and target must be node ids of this grid.")
+    def route():
+        with tenant.grid.lock:
+            return tenant.router.optimize_route(start, target, iterations=min(iterations, 200))
+    return {"grid_id": grid_id, "route": await asyncio.to_thread(route)}
 
 @app.post("/trigger-random-attack")
 async def random_attack():
     target = random.randint(0, orch.grid.num_nodes - 1)
-    orch.grid.inject_anomaly(target, "DDoS_ATTACK")
+    with orch.grid.lock:  # Physics ticks run on the worker pool; never mutate the grid mid-tick
+        orch.grid.inject_anomaly(target, "DDoS_ATTACK")
     
     msg = f"ALARM: Adversarial vector detected at Node {target}"
     system_state["logs"].append(msg)
     log_event("ATTACK_INJECTED", {"target_node": target, "type": "DDoS_ATTACK"})
     return {"target": target}
 
-def run_agentic_brain():
-    """Background task to run the AI reasoning loop without blocking the UI."""
-    try:
-        oracle = create_oracle_agent()
-        telemetry = orch.grid.fetch_live_telemetry()
-        
-        # Isolate the exact signature of the compromised node for the AI to memorize
-        signature = "Unknown Anomaly"
-        for node_id, data in telemetry.items():
-            if data['telemetry']['status'] != 'OPERATIONAL':
-                t = data['telemetry']
-                signature = f"Node {node_id}: status={t['status']}, network_latency_ms={t['network_latency_ms']}, resource_capacity_pct={t['resource_capacity_pct']}, threat_level={t['threat_level']}"
-                break
-        
-        system_state["last_anomaly_signature"] = signature
+def extract_anomaly_signature(telemetry: dict) -> str:
+    """Isolates the exact signature of the compromised node for the AI to memorize (and for job deduplication)."""
+    for node_id, data in telemetry.items():
+        if data['telemetry']['status'] != 'OPERATIONAL':
+            t = data['telemetry']
+            return f"Node {node_id}: status={t['status']}, network_latency_ms={t['network_latency_ms']}, resource_capacity_pct={t['resource_capacity_pct']}, threat_level={t['threat_level']}"
+    return "Unknown Anomaly"
 
-        task = Task(
-            description=f"Analyze current grid telemetry: {telemetry}. Use 'Search Historical Threats' tool to find matches. Provide deep tactical brief.", 
-            expected_output="Professional tactical intelligence brief including the recommended countermeasure.", 
-            agent=oracle
-        )
-        
-        result = str(Crew(agents=[oracle], tasks=[task]).kickoff())
-        
-        system_state["ai_report"] = result
-        system_state["last_recommended_action"] = "Reroute power and isolate network perimeter." # Defaulting for learning
-        system_state["pending_action"] = "ISOLATE_AND_NEUTRALIZE"
+# Each analysis worker keeps its own Oracle instead of rebuilding the agent for every job
+_worker_agents = threading.local()
+
+def run_agentic_brain(job: dict) -> dict:
+    """Runs the AI reasoning loop for one queued job and returns its result (no shared state is touched here)."""
+    # A quantized-signature hit skips the agent stack and the LLM round trip entirely
+    cache_key = canonical_signature(job['telemetry'], scope="oracle_brief")
+    report, cached = response_cache.get_or_compute(cache_key, lambda: run_oracle_brief(job))
+
+    return {
+        "report": report,
+        "cached": cached,
+        "signature": job["signature"],
+        "recommended_action": "Reroute power and isolate network perimeter.", # Defaulting for learning
+        "pending_action": "ISOLATE_AND_NEUTRALIZE"
+    }
+
+def run_oracle_brief(job: dict) -> str:
+    create_oracle_agent, Task, Crew = load_agent_stack()
+    if not hasattr(_worker_agents, "oracle"):
+        _worker_agents.oracle = create_oracle_agent()
+    oracle = _worker_agents.oracle
+
+    task = Task(
+        description=f"Analyze current grid telemetry:\n{job['summary']}\nUse 'Search Historical Threats' tool to find matches. Provide deep tactical brief.", 
+        expected_output="Professional tactical intelligence brief including the recommended countermeasure.", 
+        agent=oracle
+    )
+    return str(Crew(agents=[oracle], tasks=[task]).kickoff())
+
+def publish_analysis(job: dict):
+    """
+    Surfaces a finished job on the command-center state the dashboard watches.
+    Only the job the dashboard is waiting on is published; a superseded job must not overwrite a newer incident.
+    """
+    with analysis_publish_lock:
+        if job["id"] != system_state["active_job_id"]:
+            log_event("AI_ANALYSIS_SUPERSEDED", {"job_id": job["id"], "status": job["status"]})
+            return
+        if job["status"] == "FAILED":
+            system_state["ai_status"] = "IDLE"
+            system_state["logs"].append(f"ERROR: AI Brain failure - {job['error']}")
+            return
+
+        result = job["result"]
+        system_state["ai_report"] = result["report"]
+        system_state["last_anomaly_signature"] = result["signature"]
+        system_state["last_recommended_action"] = result["recommended_action"]
+        system_state["pending_action"] = result["pending_action"]
         system_state["ai_status"] = "AWAITING_AUTHORIZATION"
-        log_event("AI_ANALYSIS_COMPLETE", {"report_snippet": result[:100]})
-    except Exception as e:
-        system_state["ai_status"] = "IDLE"
-        system_state["logs"].append(f"ERROR: AI Brain failure - {str(e)}")
+        log_event("AI_ANALYSIS_COMPLETE", {"job_id": job["id"], "cached": result["cached"], "report_snippet": result["report"][:100]})
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("OMEGA_PROMPT_TOKEN_BUDGET", "600"))
+# Held while a job becomes active, so a job finishing straight away (cache hit) is not taken as superseded
+analysis_publish_lock = threading.Lock()
+
+analysis_queue = AnalysisJobQueue(
+    handler=run_agentic_brain,
+    max_workers=int(os.getenv("OMEGA_ANALYSIS_WORKERS", "2")),
+    max_pending=int(os.getenv("OMEGA_ANALYSIS_MAX_PENDING", "16")),
+    on_complete=publish_analysis
+)
 
 @app.post("/process-intelligence")
-async def process_ai(background_tasks: BackgroundTasks):
-    """Triggers the Agentic AI using FastAPI Background Tasks."""
-    system_state["ai_status"] = "THINKING"
-    system_state["logs"].append("SYSTEM: Waking Oracle Agent for RAG memory diagnosis...")
-    background_tasks.add_task(run_agentic_brain)
-    return {"status": "AI processing initiated"}
+async def process_ai():
+    """Queues an Oracle analysis; identical concurrent incidents share one in-flight job."""
+    # The job reads telemetry later on a worker thread: snapshot it now, the live node dicts keep changing
+    with orch.grid.lock:
+        telemetry = {node: dict(data, telemetry=dict(data['telemetry'])) for node, data in orch.grid.fetch_live_telemetry().items()}
+        columns = orch.grid.telemetry_columns()
+    signature = extract_anomaly_signature(telemetry)
+    # Only the top anomalous nodes plus grid aggregates go into the prompt
+    summary = summarize_telemetry(columns, cortex=orch.ml_cortex, token_budget=PROMPT_TOKEN_BUDGET)
+    with analysis_publish_lock:
+        try:
+            job, deduplicated = analysis_queue.submit(signature, {"telemetry": telemetry, "summary": summary})
+        except AnalysisQueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        system_state["ai_status"] = "THINKING"
+        system_state["active_job_id"] = job["id"]
+    if deduplicated:
+        system_state["logs"].append(f"SYSTEM: Incident already under analysis (job {job['id']}).")
+    else:
+        system_state["logs"].append("SYSTEM: Waking Oracle Agent for RAG memory diagnosis...")
+    return {"status": "AI processing initiated", "job_id": job["id"], "deduplicated": deduplicated}
+
+@app.get("/jobs")
+async def list_jobs(limit: int = 50):
+    return {"jobs": analysis_queue.list_jobs(limit)}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = analysis_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown analysis job {job_id}")
+    return job
+
+@app.get("/jobs/{job_id}/wait")
+async def wait_for_job(job_id: str, timeout_s: float = 25.0):
+    """Long-poll: returns as soon as the job finishes, or with its current status after `timeout_s`."""
+    future = analysis_queue.future(job_id)
+    if future is None:
+        return await get_job(job_id)
+    try:
+        await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=min(timeout_s, 60.0))
+    except asyncio.TimeoutError:
+        pass
+    return await get_job(job_id)
+
+@app.get("/approvals")
+async def list_approvals():
+    """Agent actions currently parked by the Veto Protocol, with their deadlines."""
+    return {"pending": approvals.pending()}
+
+@app.get("/approvals/{approval_id}")
+async def get_approval(approval_id: str):
+    approval = approvals.get(approval_id)
+    if approval is None:
+        raise HTTPException(status_code=404, detail=f"Unknown approval {approval_id}")
+    return approval
+
+@app.post("/approvals/{approval_id}/{choice}")
+async def decide_approval(approval_id: str, choice: str):
+    decided = approvals.resolve(approval_id, approved=(choice == "YES"))
+    if decided is None:
+        raise HTTPException(status_code=409, detail=f"Approval {approval_id} is unknown or already decided")
+    return decided
+
+@app.post("/governance/evaluate-batch")
+async def evaluate_action_batch(actions: list[dict]):
+    """Screens planner-generated candidate actions in one vectorized pass; returns a reason code per action."""
+    return {"decisions": orch.governance.evaluate_batch(actions)}
 
 @app.post("/decide/{choice}")
 async def human_decision(choice: str):
     if choice == "YES":
         # 1. Execute Countermeasure (Restore Grid)
-        for n in orch.grid.graph.nodes:
-            orch.grid.graph.nodes[n]['telemetry']['status'] = 'OPERATIONAL'
-            orch.grid.graph.nodes[n]['telemetry']['threat_level'] = 0.0
+        with orch.grid.lock:
+            for n in orch.grid.graph.nodes:
+                orch.grid.clear_anomaly(n)
         
         msg = "CMD: User APPROVED action. Grid integrity restored."
         
@@ -133,17 +567,17 @@ async def human_decision(choice: str):
         
         if signature and "OPERATIONAL" not in signature:
             memory_id = f"incident_{uuid.uuid4().hex[:8]}"
-            memory_collection.add(
-                documents=[signature],
-                metadatas=[{
-                    "anomaly": "ZERO_DAY_RESOLVED", 
-                    "proven_countermeasure": action
-                }],
-                ids=[memory_id]
-            )
-            learn_msg = f"🧠 AI LEARNED: Saved tactical footprint {memory_id} to Vector Database."
+            # Off the event loop: the first write may still be waiting on the memory warm-up
+            stored_id = await asyncio.to_thread(memory_service.learn, signature, {
+                "anomaly": "ZERO_DAY_RESOLVED", 
+                "proven_countermeasure": action
+            }, memory_id)
+            if stored_id == memory_id:
+                learn_msg = f"🧠 AI LEARNED: Saved tactical footprint {memory_id} to Vector Database."
+            else:
+                learn_msg = f"🧠 AI REINFORCED: Footprint matches known memory {stored_id}; hit count raised."
             system_state["logs"].append(learn_msg)
-            log_event("AUTO_LEARNING_TRIGGERED", {"id": memory_id, "signature": signature})
+            log_event("AUTO_LEARNING_TRIGGERED", {"id": stored_id, "signature": signature})
 
     else:
         msg = "CMD: User VETOED action. Node remains compromised."
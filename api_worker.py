@@ -0,0 +1,116 @@
+import asyncio
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+
+from app.core.engine_host import RING_NAME, EngineClient
+from app.core.shared_ring import SharedFrameRing
+from app.core.telemetry_frame import FRAME_MEDIA_TYPE, unpack_columns
+from app.core.grid_analytics import tile_heatmap, region_latency_quantiles, node_page, to_json_ready
+
+# ==========================================
+# 🔀 STATELESS API WORKER
+# ==========================================
+# Start one engine (`python -m app.core.engine_host`), then any number of workers:
+#   uvicorn api_worker:app --workers 4
+# Telemetry and analytics are computed straight from the engine's shared-memory ring (no copy, no engine
+# round trip). Every other route, including all decisions, is forwarded over the command channel to the one
+# engine process, so there is a single simulation, model, approval queue and log no matter the worker count.
+
+app = FastAPI(title="City Connect Omega: API Worker")
+engine = EngineClient()
+_ring = None
+
+
+def ring() -> SharedFrameRing:
+    """Attaches to the engine's ring on first use (the engine may come up after the workers)."""
+    global _ring
+    if _ring is None:
+        try:
+            _ring = SharedFrameRing.attach(RING_NAME)
+        except FileNotFoundError:
+            raise HTTPException(status_code=503, detail="Engine not running (no shared telemetry ring yet).")
+    return _ring
+
+
+def read_snapshot(consume):
+    """Runs consume(columns, meta) on the newest frame in place; status codes are expanded to labels."""
+    def decode(view):
+        columns, meta = unpack_columns(view)
+        columns = dict(columns)
+        if "status" in columns and "status_categories" in meta:
+            columns["status"] = np.asarray(meta["status_categories"])[columns["status"]]
+        return consume(columns, meta)
+
+    result = ring().read(decode)
+    if result is None:
+        raise HTTPException(status_code=503, detail="Engine has not published a snapshot yet.")
+    return result
+
+
+@app.get("/telemetry")
+async def get_telemetry(request: Request):
+    if FRAME_MEDIA_TYPE in request.headers.get("accept", ""):
+        frame = ring().latest_bytes()
+        if frame is None:
+            raise HTTPException(status_code=503, detail="Engine has not published a snapshot yet.")
+        return Response(content=frame, media_type=FRAME_MEDIA_TYPE)
+
+    def as_json(columns, meta):
+        table = pd.DataFrame({k: v for k, v in columns.items() if k not in ("node_id", "anomaly_score")},
+                             index=np.asarray(columns["node_id"]).tolist())
+        telemetry = {node: {"telemetry": row} for node, row in table.to_dict(orient="index").items()}
+        return {"telemetry": telemetry, "alerts": meta["alerts"], "system": meta["system"]}
+
+    return read_snapshot(as_json)
+
+
+@app.get("/analytics/heatmap")
+async def get_heatmap(tile_m: float = Query(100.0, gt=0)):
+    try:
+        return read_snapshot(lambda c, m: to_json_ready(tile_heatmap(c, tile_m=tile_m, grid_size=m["grid_size"])))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/analytics/latency-quantiles")
+async def get_latency_quantiles(region_m: float = Query(250.0, gt=0)):
+    try:
+        return read_snapshot(lambda c, m: to_json_ready(region_latency_quantiles(c, region_m=region_m, grid_size=m["grid_size"])))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/analytics/nodes")
+async def get_node_page(page: int = 0, page_size: int = 50, sort_by: str = "threat_level", descending: bool = True):
+    try:
+        return read_snapshot(lambda c, m: to_json_ready(node_page(c, page=page, page_size=min(page_size, 500),
+                                                                 sort_by=sort_by, descending=descending)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/engine")
+async def get_engine_status():
+    """Which engine frame this worker sees (useful to confirm every worker shares one engine) and whether it is stale."""
+    shared = ring()
+    return read_snapshot(lambda c, m: {"tick": m["tick"], "ring_sequence": shared.sequence, "nodes": len(c["node_id"]),
+                                       "stale": shared.frames_behind > 0, "frames_behind": shared.frames_behind,
+                                       "dropped_frames": shared.dropped_frames})
+
+
+@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
+async def forward_to_engine(path: str, request: Request):
+    """Everything else runs in the engine process (the worker thread waits, the event loop does not)."""
+    forwarded = {
+        "method": request.method,
+        "path": "/" + path,
+        "query": list(request.query_params.multi_items()),
+        "body": await request.body(),
+        "headers": {k: v for k, v in request.headers.items() if k in ("accept", "content-type")}
+    }
+    try:
+        reply = await asyncio.to_thread(engine.call, forwarded)
+    except (ConnectionError, OSError) as e:
+        raise HTTPException(status_code=503, detail=f"Engine unavailable: {e}")
+    return Response(content=reply["body"], status_code=reply["status"], media_type=reply["headers"].get("content-type") or None)
@@ -1,16 +1,17 @@
-__import__('pysqlite3')
-import sys
-sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+from app.memory.memory_service import ensure_modern_sqlite
+ensure_modern_sqlite()
 
-import os
 from dotenv import load_dotenv
-from crewai import Agent, Task, Crew, Process, LLM
+from crewai import Agent, Task, Crew, Process
 from crewai.tools import tool
 from textwrap import dedent
+from typing import Callable
 
 # Import the Governance Layer and the Oracle Agent we already built
 from app.core.veto_protocol import VetoProtocol
-from app.agents.oracle_agent import create_oracle_agent
+from app.agents.oracle_agent import create_oracle_agent, live_grid
+from app.agents.llm_factory import build_llm
+from app.agents.response_cache import canonical_signature, get_response_cache
 
 load_dotenv()
 governance_layer = VetoProtocol()
@@ -19,33 +20,66 @@ governance_layer = VetoProtocol()
 # 1. DEFINE THE EXECUTIVE'S ACTION TOOL
 # ==========================================
 
-@tool("Execute Tactical Action")
-def execute_tactical_action(action_name: str, target_node: int, estimated_cost: float) -> str:
+def build_tactical_action_tool(executed_actions: list):
     """
-    Executes a defensive or logistical action on the grid.
-    You must provide the exact action_name (e.g., 'DEPLOY_COUNTERMEASURES', 'ISOLATE_NODE'), 
-    the target_node (int), and the estimated_cost (float).
+    The Executive's action tool for ONE chain run. Requested actions are recorded into that run's own
+    `executed_actions` list (cached with the response so repeats can be replayed); concurrent runs never share it.
     """
+    @tool("Execute Tactical Action")
+    def execute_tactical_action(action_name: str, target_node: int, estimated_cost: float) -> str:
+        """
+        Executes a defensive or logistical action on the grid.
+        You must provide the exact action_name (e.g., 'DEPLOY_COUNTERMEASURES', 'ISOLATE_NODE'), 
+        the target_node (int), and the estimated_cost (float).
+        """
+        executed_actions.append({'action_name': action_name, 'target_node': target_node, 'estimated_cost': estimated_cost})
+        return _execute_action(action_name, target_node, estimated_cost)
+
+    return execute_tactical_action
+
+def _execute_action(action_name: str, target_node: int, estimated_cost: float) -> str:
     params = {'target_node': target_node, 'estimated_cost': estimated_cost}
+
+    # With an approval broker, flagged actions are parked for the Human Commander and the crew moves on
+    if governance_layer.broker is not None:
+        ticket = governance_layer.request_authorization(
+            "Executive_Agent", action_name, params,
+            on_decision=lambda approval: _actuate(action_name, target_node) if approval["status"] == "APPROVED" else None
+        )
+        if ticket["status"] == "PENDING":
+            return (f"PENDING: Action '{action_name}' on Node {target_node} is queued for Human Commander approval "
+                    f"(approval id {ticket['approval_id']}). It will execute automatically if approved.")
+        return _actuate(action_name, target_node)
     
     # This routes the AI's requested action through your Python security rules
     is_authorized = governance_layer.evaluate_agent_action("Executive_Agent", action_name, params)
 
     if is_authorized:
-        return f"SUCCESS: Action '{action_name}' executed on Node {target_node}."
+        return _actuate(action_name, target_node)
     else:
         return f"BLOCKED: Action '{action_name}' was vetoed by the Human Commander."
 
+# Optional hook that applies an authorized action to the live grid (bound by the host process)
+actuator = None
+
+def attach_governance(protocol: VetoProtocol, action_actuator: Callable[[str, int], None] | None = None):
+    """Routes the Executive's actions through the host's governance layer (and its approval broker)."""
+    global governance_layer, actuator
+    governance_layer = protocol
+    actuator = action_actuator
+
+def _actuate(action_name: str, target_node: int) -> str:
+    if actuator is not None:
+        actuator(action_name, target_node)
+    return f"SUCCESS: Action '{action_name}' executed on Node {target_node}."
+
 # ==========================================
 # 2. DEFINE THE EXECUTIVE AGENT
 # ==========================================
 
-def create_executive_agent() -> Agent:
-    groq_llm = LLM(
-        model="groq/llama-3.3-70b-versatile",
-        api_key=os.getenv("GROQ_API_KEY"),
-        temperature=0.1
-    )
+def create_executive_agent(executed_actions: list | None = None) -> Agent:
+    """`executed_actions` collects the actions this agent requests (a throwaway list if not given)."""
+    groq_llm = build_llm(temperature=0.1)
 
     return Agent(
         role="Lead Executive Commander",
@@ -58,7 +92,7 @@ def create_executive_agent() -> Agent:
         """),
         verbose=True,
         allow_delegation=False,
-        tools=[execute_tactical_action],
+        tools=[build_tactical_action_tool(executed_actions if executed_actions is not None else [])],
         llm=groq_llm
     )
 
@@ -67,9 +101,20 @@ def create_executive_agent() -> Agent:
 # ==========================================
 
 def run_full_incident_response():
-    # Instantiate Both Agents
+    # Repeat incidents skip both model round trips: the cached chain's actions are replayed through governance
+    cache = get_response_cache()
+    cache_key = canonical_signature(live_grid().fetch_live_telemetry(), scope="incident_response")
+    cached = cache.get(cache_key)
+    if cached is not None:
+        print("\n[SYSTEM] Known incident signature. Replaying cached response plan...\n")
+        outcomes = [_execute_action(**action) for action in cached["actions"]]
+        print(cached["summary"])
+        return "\n".join([cached["summary"], *outcomes])
+
+    # Instantiate Both Agents (this run's actions are collected in its own list)
+    executed_actions = []
     oracle = create_oracle_agent()
-    executive = create_executive_agent()
+    executive = create_executive_agent(executed_actions)
 
     # Task 1: Oracle diagnoses the grid
     diagnostic_task = Task(
@@ -99,7 +144,9 @@ def run_full_incident_response():
     )
 
     print("\n[SYSTEM] Initiating Multi-Agent Swarm Response...\n")
-    incident_response_crew.kickoff()
+    result = str(incident_response_crew.kickoff())
+    cache.put(cache_key, {"summary": result, "actions": executed_actions})
+    return result
 
 if __name__ == "__main__":
     run_full_incident_response()
\ No newline at end of file
@@ -1,51 +1,44 @@
-__import__('pysqlite3')
-import sys
-sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+from app.memory.memory_service import ensure_modern_sqlite
+ensure_modern_sqlite()
 
-import os
-import chromadb
 from dotenv import load_dotenv
-from crewai import Agent, Task, Crew, Process, LLM
+from crewai import Agent, Task, Crew, Process
 from crewai.tools import tool
 from textwrap import dedent
 
 # Load your secure API keys from the .env file
 load_dotenv()
 
-# Import your simulated physical layer and governance layer
+# Import your simulated physical layer, governance layer and the shared vector memory
 from app.simulation.city_grid import CityConnectGrid
 from app.core.veto_protocol import VetoProtocol
+from app.memory.memory_service import get_memory_service
+from app.agents.llm_factory import build_llm
+from app.agents.telemetry_summarizer import summarize_telemetry
 
-# Initialize the lab environment instances
-iot_grid = CityConnectGrid(num_nodes=5)
 governance_layer = VetoProtocol()
 
-# Inject a test anomaly so the Oracle has something to detect
-iot_grid.inject_anomaly(target_node=2, anomaly_type="DDoS_ATTACK")
-
 # ==========================================
-# 1. INITIALIZE VECTOR MEMORY (CHROMADB)
+# 1. BIND THE LIVE GRID
 # ==========================================
-print("[SYSTEM] Booting Episodic Vector Memory Cortex...")
-
-# PersistentClient ensures the AI remembers past runs even if you restart the server
-chroma_client = chromadb.PersistentClient(path="./omega_memory")
-memory_collection = chroma_client.get_or_create_collection(name="threat_signatures")
-
-# Pre-seed the memory so the AI has "experience" to draw from on its first run
-if memory_collection.count() == 0:
-    print("[SYSTEM] First boot detected. Seeding Vector DB with historical defense logs...")
-    memory_collection.add(
-        documents=[
-            "Node status COMPROMISED. High network latency > 500ms. Resource capacity dropped below 20%.",
-            "Node status COMPROMISED. Zero network latency. Resource capacity at 0%."
-        ],
-        metadatas=[
-            {"anomaly": "DDoS_ATTACK", "proven_countermeasure": "Isolate node from swarm routing and reboot firewall."},
-            {"anomaly": "POWER_FAILURE", "proven_countermeasure": "Reroute power from adjacent grid and dispatch physical maintenance drone."}
-        ],
-        ids=["incident_alpha", "incident_beta"]
-    )
+# The grid the sensory tool reads from. Hosts (api_server, main) attach their own grid; standalone
+# lab runs lazily build one with a test anomaly so the Oracle has something to detect.
+iot_grid = None
+ml_cortex = None
+
+def attach_grid(grid: CityConnectGrid, cortex=None):
+    """Binds the grid (and optionally the trained PredictiveCortex used to rank nodes) the tools read."""
+    global iot_grid, ml_cortex
+    iot_grid = grid
+    ml_cortex = cortex
+
+def live_grid() -> CityConnectGrid:
+    """The attached grid (other agent chains key their caches on it); builds the lab grid if none is attached."""
+    if iot_grid is None:
+        lab_grid = CityConnectGrid(num_nodes=5)
+        lab_grid.inject_anomaly(target_node=2, anomaly_type="DDoS_ATTACK")
+        attach_grid(lab_grid)
+    return iot_grid
 
 # ==========================================
 # 2. DEFINE THE SENSORY & COGNITIVE TOOLS
@@ -54,11 +47,10 @@ if memory_collection.count() == 0:
 @tool("Fetch IoT Telemetry")
 def fetch_iot_telemetry(query: str = "all") -> str:
     """
-    Fetches the live telemetry data from all smart city/defense grid IoT nodes.
-    The agent uses this to monitor network latency, resource capacity, and threat levels.
+    Fetches a compact summary of the live smart city/defense grid: grid-wide aggregates plus the
+    most anomalous IoT nodes with their network latency, resource capacity, and threat levels.
     """
-    data = iot_grid.fetch_live_telemetry()
-    return f"Live Grid Data: {data}"
+    return f"Live Grid Data: {summarize_telemetry(live_grid().telemetry_columns(), cortex=ml_cortex)}"
 
 @tool("Search Historical Threats")
 def search_historical_threats(anomaly_description: str) -> str:
@@ -66,10 +58,7 @@ def search_historical_threats(anomaly_description: str) -> str:
     Searches the Vector Database (Long-Term Memory) for historical telemetry signatures
     that match the current anomaly. Returns proven countermeasures if a match is found.
     """
-    results = memory_collection.query(
-        query_texts=[anomaly_description],
-        n_results=1
-    )
+    results = get_memory_service().search(anomaly_description, n_results=1)
     
     if results and results['documents'] and results['documents'][0]:
         historical_match = results['documents'][0][0]
@@ -87,11 +76,7 @@ def search_historical_threats(anomaly_description: str) -> str:
 def create_oracle_agent() -> Agent:
     """Instantiates the Oracle Agent using CrewAI's native Groq integration."""
     
-    groq_llm = LLM(
-        model="groq/llama-3.3-70b-versatile", 
-        api_key=os.getenv("GROQ_API_KEY"),
-        temperature=0.0 # Zero temperature for absolute precision in memory retrieval
-    )
+    groq_llm = build_llm(temperature=0.0) # Zero temperature for absolute precision in memory retrieval
 
     return Agent(
         role="Lead Threat Intelligence Oracle",
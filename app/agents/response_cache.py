@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+# Quantization steps: telemetry that differs by less than one step maps onto the same cache entry
+LATENCY_STEP_MS = 25.0
+CAPACITY_STEP_PCT = 5.0
+THREAT_STEP = 0.05
+
+
+def _quantize(value: float, step: float) -> float:
+    return round(round(float(value) / step) * step, 4)
+
+
+def canonical_signature(telemetry: dict, scope: str) -> str:
+    """
+    Reduces a grid telemetry dump to a stable cache key.
+    Only non-operational nodes count; their readings are quantized and sorted so near-identical
+    incidents (999.9ms vs 1001.2ms) resolve to the same key. `scope` separates different agent chains.
+    """
+    anomalous = sorted(
+        (int(node_id), t['status'], _quantize(t['network_latency_ms'], LATENCY_STEP_MS),
+         _quantize(t['resource_capacity_pct'], CAPACITY_STEP_PCT), _quantize(t['threat_level'], THREAT_STEP))
+        for node_id, data in telemetry.items()
+        for t in [data['telemetry']]
+        if t['status'] != 'OPERATIONAL'
+    )
+    canonical = json.dumps({"scope": scope, "nodes": anomalous}, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class AgentResponseCache:
+    def __init__(self, path: str = "./omega_cache/agent_responses.json", ttl_s: float = 3600.0, max_entries: int = 512):
+        """
+        LRU + TTL cache of agent/LLM responses keyed by canonical anomaly signature.
+        Entries are persisted to a JSON file (atomic replace) so repeat incidents stay cheap across restarts.
+        """
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[CACHE] Ignoring unreadable response cache {self.path}: {e}")
+            return
+        now = time.time()
+        for key, entry in stored.items():
+            if entry["expires_at"] > now:
+                self._entries[key] = entry
+
+    def _persist(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["expires_at"] <= time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = {"value": value, "expires_at": time.time() + self.ttl_s}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._persist()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> tuple:
+        """Returns (value, was_cached). `compute` runs only on a miss and its result is stored."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        value = compute()
+        self.put(key, value)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._persist()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> AgentResponseCache:
+    """Process-wide response cache shared by the API server and the multi-agent chains."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AgentResponseCache(
+                    path=os.getenv("OMEGA_RESPONSE_CACHE_PATH", "./omega_cache/agent_responses.json"),
+                    ttl_s=float(os.getenv("OMEGA_RESPONSE_CACHE_TTL_S", "3600")),
+                    max_entries=int(os.getenv("OMEGA_RESPONSE_CACHE_MAX_ENTRIES", "512"))
+                )
+    return _cache
@@ -0,0 +1,56 @@
+import numpy as np
+from collections import Counter
+
+# Rough chars-per-token ratio for Llama-family tokenizers on numeric telemetry text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def summarize_telemetry(columns: dict, cortex=None, top_k: int = 8, token_budget: int = 600) -> str:
+    """
+    Compacts a grid snapshot (see CityConnectGrid.telemetry_columns) into an LLM-sized brief:
+    grid-wide aggregates plus the top-k nodes (non-operational first, then by PredictiveCortex anomaly score).
+    Prompt size stays bounded by `token_budget` no matter how many nodes the grid has.
+    """
+    node_ids = np.asarray(columns['node_id'])
+    latency = np.asarray(columns['network_latency_ms'], dtype=np.float64)
+    capacity = np.asarray(columns['resource_capacity_pct'], dtype=np.float64)
+    threat = np.asarray(columns['threat_level'], dtype=np.float64)
+    status = list(columns['status'])
+    if len(node_ids) == 0:
+        return "GRID SUMMARY: no nodes reporting."
+
+    # Lower score = more anomalous. Without a trained cortex, fall back to ranking by threat level.
+    if cortex is not None and cortex.is_trained:
+        flagged, scores = cortex.score_columns(columns)
+    else:
+        scores = -threat
+        flagged = threat >= 0.8
+
+    status_counts = ", ".join(f"{s}={c}" for s, c in Counter(status).most_common())
+    header = (
+        f"GRID SUMMARY: {len(node_ids)} nodes ({status_counts}); ML anomalies={int(np.count_nonzero(flagged))}\n"
+        f"latency_ms mean={latency.mean():.1f} p95={np.percentile(latency, 95):.1f} max={latency.max():.1f} | "
+        f"capacity_pct mean={capacity.mean():.1f} min={capacity.min():.1f} | "
+        f"threat mean={threat.mean():.3f} max={threat.max():.3f}\n"
+    )
+
+    # Nodes already reporting a non-operational status always lead; the forest saturates on extreme readings
+    operational = np.asarray([st == 'OPERATIONAL' for st in status])
+    ranked = np.lexsort((scores, operational))[:top_k]
+    lines = [
+        f"Node {int(node_ids[i])}: status={status[i]}, network_latency_ms={latency[i]:.1f}, "
+        f"resource_capacity_pct={capacity[i]:.1f}, threat_level={threat[i]:.3f}, anomaly_score={float(scores[i]):.4f}"
+        for i in ranked
+    ]
+
+    # Drop the least anomalous lines until the brief fits the budget
+    while lines:
+        brief = header + f"TOP {len(lines)} NODES BY ANOMALY SCORE:\n" + "\n".join(lines)
+        if estimate_tokens(brief) <= token_budget:
+            return brief
+        lines.pop()
+    return header
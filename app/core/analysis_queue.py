@@ -0,0 +1,103 @@
+import uuid
+import threading
+from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, List, Optional
+
+
+class AnalysisQueueFull(Exception):
+    """Raised when the bounded queue already holds the maximum number of unfinished jobs."""
+
+
+class AnalysisJobQueue:
+    def __init__(self, handler: Callable[[Dict[str, Any]], Any], max_workers: int = 2, max_pending: int = 16,
+                 retain_finished: int = 256, on_complete: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Bounded worker pool for LLM-bound incident analysis.
+        Jobs are deduplicated by anomaly signature: while a signature is queued or running, further
+        submissions attach to the in-flight job instead of starting another model round trip.
+        """
+        self.handler = handler
+        self.max_pending = max_pending
+        self.retain_finished = retain_finished
+        self.on_complete = on_complete
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="omega-analysis")
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._inflight: Dict[str, str] = {}  # signature -> job id
+        self._lock = threading.Lock()
+
+    def submit(self, signature: str, payload: Dict[str, Any]) -> tuple:
+        """Queues analysis for `signature`. Returns (job snapshot, deduplicated flag)."""
+        with self._lock:
+            existing = self._inflight.get(signature)
+            if existing is not None:
+                self._jobs[existing]["subscribers"] += 1
+                return dict(self._jobs[existing]), True
+
+            if len(self._inflight) >= self.max_pending:
+                raise AnalysisQueueFull(f"{len(self._inflight)} analyses already in flight (limit {self.max_pending}).")
+
+            job_id = uuid.uuid4().hex[:12]
+            job = {
+                "id": job_id,
+                "signature": signature,
+                "status": "QUEUED",
+                "subscribers": 1,
+                "result": None,
+                "error": None,
+                "submitted_at": datetime.now().isoformat(),
+                "started_at": None,
+                "finished_at": None
+            }
+            self._jobs[job_id] = job
+            self._inflight[signature] = job_id
+            self._futures[job_id] = self._executor.submit(self._run, job_id, payload)
+            self._evict_finished()
+            return dict(job), False
+
+    def _run(self, job_id: str, payload: Dict[str, Any]):
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = "RUNNING"
+            job["started_at"] = datetime.now().isoformat()
+
+        try:
+            result, status, error = self.handler(dict(payload, signature=job["signature"])), "COMPLETED", None
+        except Exception as e:
+            result, status, error = None, "FAILED", str(e)
+
+        with self._lock:
+            job.update(status=status, result=result, error=error, finished_at=datetime.now().isoformat())
+            self._inflight.pop(job["signature"], None)
+            snapshot = dict(job)
+
+        if self.on_complete:
+            self.on_complete(snapshot)
+        return snapshot
+
+    def _evict_finished(self):
+        """Keeps only the most recent finished jobs queryable so the registry stays bounded."""
+        finished = [jid for jid, j in self._jobs.items() if j["status"] in ("COMPLETED", "FAILED")]
+        for jid in finished[:max(0, len(finished) - self.retain_finished)]:
+            del self._jobs[jid]
+            self._futures.pop(jid, None)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def future(self, job_id: str) -> Optional[Future]:
+        """Completion future for long-polling callers (resolves to the finished job snapshot)."""
+        with self._lock:
+            return self._futures.get(job_id)
+
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(j) for j in list(self._jobs.values())[-limit:]]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
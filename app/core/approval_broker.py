@@ -0,0 +1,105 @@
+import time
+import uuid
+import asyncio
+import threading
+from datetime import datetime
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ApprovalBroker:
+    def __init__(self, default_timeout_s: float = 300.0, approve_on_timeout: bool = False, retain_decided: int = 256):
+        """
+        Asynchronous Human-in-the-Loop approval queue for the Veto Protocol.
+        Flagged actions are parked here with an id and a deadline instead of blocking a thread on input().
+        Each approval resolves a Future (and optional callback) when a human decides or the deadline passes,
+        in which case the configured default decision applies (veto unless approve_on_timeout).
+        """
+        self.default_timeout_s = default_timeout_s
+        self.approve_on_timeout = approve_on_timeout
+        self.retain_decided = retain_decided
+        self._approvals: Dict[str, Dict[str, Any]] = {}
+        self._futures: Dict[str, Future] = {}
+        self._callbacks: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]):
+        """Registers a listener notified of every decision (audit logging, UI state)."""
+        self._listeners.append(listener)
+
+    def submit(self, agent_name: str, action: str, params: Dict[str, Any], reason: str,
+               timeout_s: Optional[float] = None, on_decision: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        timeout_s = self.default_timeout_s if timeout_s is None else timeout_s
+        approval = {
+            "id": uuid.uuid4().hex[:10],
+            "agent": agent_name,
+            "action": action,
+            "params": dict(params),
+            "reason": reason,
+            "status": "PENDING",
+            "created_at": datetime.now().isoformat(),
+            "deadline": time.time() + timeout_s,
+            "decided_by": None
+        }
+        with self._lock:
+            self._approvals[approval["id"]] = approval
+            self._futures[approval["id"]] = Future()
+            if on_decision:
+                self._callbacks[approval["id"]] = on_decision
+            self._prune_decided()
+        return dict(approval)
+
+    def _prune_decided(self):
+        """Keeps only the most recent decided approvals so the audit view stays bounded."""
+        decided = [aid for aid, a in self._approvals.items() if a["status"] != "PENDING"]
+        for aid in decided[:max(0, len(decided) - self.retain_decided)]:
+            del self._approvals[aid]
+
+    def resolve(self, approval_id: str, approved: bool, decided_by: str = "HUMAN_COMMANDER") -> Optional[Dict[str, Any]]:
+        """Records a decision. Returns the decided approval, or None if it is unknown or already decided."""
+        with self._lock:
+            approval = self._approvals.get(approval_id)
+            if approval is None or approval["status"] != "PENDING":
+                return None
+            approval["status"] = "APPROVED" if approved else "VETOED"
+            approval["decided_by"] = decided_by
+            snapshot = dict(approval)
+            future = self._futures.pop(approval_id)
+            callback = self._callbacks.pop(approval_id, None)
+
+        future.set_result(approved)
+        for notify in ([callback] if callback else []) + self._listeners:
+            try:
+                notify(snapshot)
+            except Exception as e:
+                print(f"[GOVERNANCE] Approval callback failed for {approval_id}: {e}")
+        return snapshot
+
+    def expire_overdue(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Applies the default decision to every approval past its deadline. Cheap enough to call every tick."""
+        now = time.time() if now is None else now
+        with self._lock:
+            overdue = [a["id"] for a in self._approvals.values() if a["status"] == "PENDING" and a["deadline"] <= now]
+        decided = [self.resolve(approval_id, self.approve_on_timeout, decided_by="TIMEOUT_DEFAULT") for approval_id in overdue]
+        return [d for d in decided if d is not None]
+
+    def pending(self) -> List[Dict[str, Any]]:
+        self.expire_overdue()
+        with self._lock:
+            return [dict(a) for a in self._approvals.values() if a["status"] == "PENDING"]
+
+    def get(self, approval_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            approval = self._approvals.get(approval_id)
+            return dict(approval) if approval else None
+
+    def wait(self, approval_id: str, timeout: Optional[float] = None) -> Optional[bool]:
+        """Blocking wait for a decision (for scripts); returns None if the approval is unknown or already decided."""
+        future = self._futures.get(approval_id)
+        return future.result(timeout=timeout) if future else None
+
+    async def wait_async(self, approval_id: str) -> Optional[bool]:
+        """Awaitable decision for event-loop callers; does not occupy a worker thread while pending."""
+        future = self._futures.get(approval_id)
+        return await asyncio.wrap_future(future) if future else None
@@ -0,0 +1,216 @@
+import os
+import json
+import mmap
+import time
+import threading
+import numpy as np
+from typing import Any, Dict, Optional
+
+from app.core.telemetry_frame import pack_columns, unpack_columns
+from app.core.grid_tenancy import DEFAULT_GRID
+
+# Two slot files are written alternately; the manifest names the last one that was completely written
+_SLOTS = ("checkpoint.a.omgf", "checkpoint.b.omgf")
+_MANIFEST = "CURRENT.json"
+
+
+class CheckpointManager:
+    def __init__(self, orchestrator, root: str = "./omega_checkpoints", state: Optional[Dict[str, Any]] = None):
+        """
+        Crash-consistent snapshots of the engine: grid telemetry, attack baselines, swarm pheromones,
+        the trained cortex weights and (optionally) the command-center `state` dict. Every hosted tenant grid
+        is included (its columns prefixed 'grid.<id>.') and re-created on restore.
+
+        capture() runs at a tick boundary on the engine loop and only copies arrays; packing and disk I/O
+        happen on a writer thread. Slots are double-buffered: the writer always fills the slot the manifest
+        does not point at, so a crash mid-write leaves the previous checkpoint intact.
+        Files use the telemetry frame layout, so restore() maps a file and reads its columns without copying.
+
+        The cortex weights are stored pickled and unpickled on restore, so `root` must be a TRUSTED directory
+        that only the engine's own user can write (it is created with mode 0700): anyone able to plant a
+        checkpoint there can run code in the engine process.
+        """
+        self.orch = orchestrator
+        self.root = root
+        self.state = state
+        os.makedirs(root, mode=0o700, exist_ok=True)
+
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._model_blob = np.zeros(0, dtype=np.uint8)
+        self._model_version = None
+        self.pending_model: Optional[bytes] = None  # Restored weights not yet loaded (see restore(defer_model=True))
+        self.last_written: Optional[Dict[str, Any]] = self.manifest()
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.root, _MANIFEST)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    # ==========================================
+    # CHECKPOINT
+    # ==========================================
+    def _model_column(self) -> np.ndarray:
+        """Pickled cortex weights as a uint8 column, re-serialized only after the model is retrained."""
+        cortex = self.orch.ml_cortex
+        if cortex.is_trained and cortex.model_version != self._model_version:
+            self._model_blob = np.frombuffer(cortex.export_model(), dtype=np.uint8)
+            self._model_version = cortex.model_version
+        return self._model_blob
+
+    def capture(self) -> bool:
+        """
+        Snapshots the engine at the current tick boundary and hands it to the writer thread.
+        Returns False (and skips this checkpoint) if the previous one is still being written.
+        """
+        with self._lock:
+            if self._writer is not None and self._writer.is_alive():
+                return False
+
+            # Ingestion appliers and carried-over ticks write the grid under its lock; export a consistent view
+            with self.orch.grid.lock:
+                grid_state = self.orch.grid.export_state()
+                tick = self.orch.ticks
+            columns = dict(grid_state["columns"], model=self._model_column())
+            tenants = {}
+            for grid_id, tenant in list(self.orch.tenants.items()):
+                if grid_id == DEFAULT_GRID:
+                    continue
+                with tenant.grid.lock:
+                    tenant_state = tenant.grid.export_state()
+                columns.update({f"grid.{grid_id}.{name}": values for name, values in tenant_state["columns"].items()})
+                tenants[grid_id] = {"num_nodes": tenant.grid.num_nodes, "tick_interval_s": tenant.tick_interval_s,
+                                    "dt": tenant.dt, "tick": tenant.ticks, "status_categories": tenant_state["status_categories"]}
+            meta = {
+                "tick": tick,
+                "created_at": time.time(),
+                "num_nodes": self.orch.grid.num_nodes,
+                "status_categories": grid_state["status_categories"],
+                "model_version": self._model_version,
+                "tenants": tenants,
+                "state": json.loads(json.dumps(self.state, default=str)) if self.state is not None else None
+            }
+            self._writer = threading.Thread(target=self._write, args=(columns, meta), name="omega-checkpoint", daemon=True)
+            self._writer.start()
+            return True
+
+    def _write(self, columns: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        current = self.last_written["slot"] if self.last_written else None
+        slot = _SLOTS[1] if current == _SLOTS[0] else _SLOTS[0]
+        frame = pack_columns(columns, meta)
+
+        path = os.path.join(self.root, slot)
+        with open(path, "wb") as f:
+            f.write(frame)
+            f.flush()
+            os.fsync(f.fileno())
+
+        manifest = {"slot": slot, "tick": meta["tick"], "created_at": meta["created_at"], "bytes": len(frame)}
+        tmp = os.path.join(self.root, _MANIFEST + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.root, _MANIFEST))  # Atomic flip to the new slot
+        self.last_written = manifest
+
+    def checkpoint_now(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Blocking checkpoint (shutdown, tests): waits for any in-flight write, then writes a fresh one."""
+        self.wait(timeout)
+        self.capture()
+        self.wait(timeout)
+        return self.last_written
+
+    def wait(self, timeout: Optional[float] = None):
+        writer = self._writer
+        if writer is not None:
+            writer.join(timeout)
+
+    # ==========================================
+    # RESTORE
+    # ==========================================
+    def restore(self, defer_model: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Loads the latest complete checkpoint into the orchestrator (and `state`). Returns its metadata,
+        or None when there is nothing to restore or the snapshot does not fit the running grid.
+        `defer_model=True` only keeps the cortex weights in `pending_model` (unpickling imports sklearn, which
+        would hold up a fast start); call restore_model() from a background thread to load them.
+        """
+        manifest = self.manifest()
+        if manifest is None:
+            return None
+
+        path = os.path.join(self.root, manifest["slot"])
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            columns, meta = unpack_columns(mapped)
+            try:
+                self.orch.grid.restore_state(columns, meta["status_categories"])
+            except (KeyError, ValueError) as e:  # Different grid size or a snapshot missing state columns
+                print(f"[SYSTEM] Checkpoint {manifest['slot']} skipped: {e}")
+                return None
+            model = columns["model"].tobytes()
+            self._restore_tenants(columns, meta.get("tenants", {}))
+            del columns  # Release the zero-copy views before the map closes
+
+        self.orch.ticks = meta["tick"]
+        self._model_version = None  # Re-serialize from the restored weights on the next capture
+        if defer_model:
+            # Until restore_model() runs, checkpoints keep carrying the restored weights
+            self.pending_model = model or None
+            self._model_blob = np.frombuffer(model, dtype=np.uint8)
+        else:
+            self.orch.ml_cortex.load_model(model)
+        if self.state is not None and meta.get("state"):
+            self.state.clear()
+            self.state.update(meta["state"])
+        self.last_written = manifest
+        print(f"[SYSTEM] Restored checkpoint from tick {meta['tick']} ({manifest['slot']}).")
+        return meta
+
+    def _restore_tenants(self, columns: Dict[str, np.ndarray], tenants: Dict[str, Dict[str, Any]]):
+        """Re-creates tenant grids (or reuses ones already configured with the same size) and loads their state."""
+        for grid_id, info in tenants.items():
+            prefix = f"grid.{grid_id}."
+            tenant_columns = {name[len(prefix):]: values for name, values in columns.items() if name.startswith(prefix)}
+            tenant = self.orch.tenants.get(grid_id)
+            if tenant is None:
+                tenant = self.orch.add_grid(grid_id, num_nodes=info["num_nodes"], tick_interval_s=info["tick_interval_s"], dt=info["dt"])
+            try:
+                tenant.grid.restore_state(tenant_columns, info["status_categories"])
+            except (KeyError, ValueError) as e:
+                print(f"[SYSTEM] Grid '{grid_id}' not restored: {e}")
+                continue
+            tenant.ticks = info["tick"]
+
+    def restore_model(self) -> bool:
+        """Loads weights deferred by restore(defer_model=True) into the cortex. Returns False if there were none."""
+        model, self.pending_model = self.pending_model, None
+        if model is None:
+            return False
+        self.orch.ml_cortex.load_model(model)
+        return True
+
+
+# --- Quick Lab Test ---
+if __name__ == "__main__":
+    import tempfile
+    from app.core.orchestrator import OmegaOrchestrator
+
+    root = tempfile.mkdtemp(prefix="omega_ckpt_")
+    source = OmegaOrchestrator(history_root=os.path.join(root, "history"))
+    source.grid.inject_anomaly(target_node=2, anomaly_type="DDoS_ATTACK")
+    for _ in range(5):
+        source.run_cycle()
+    state = {"logs": ["SYSTEM: Core initialized."], "ai_status": "IDLE"}
+    CheckpointManager(source, root=root, state=state).checkpoint_now()
+
+    restored_state = {}
+    target = OmegaOrchestrator(pretrain=False, history_root=os.path.join(root, "history"))
+    start = time.perf_counter()
+    meta = CheckpointManager(target, root=root, state=restored_state).restore()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    same = all(np.allclose(source.grid.telemetry_columns()[f], target.grid.telemetry_columns()[f]) for f in ("x", "y", "threat_level"))
+    print(f"[SYSTEM] Restore took {elapsed:.1f} ms; telemetry identical: {same}; model trained: {target.ml_cortex.is_trained}")
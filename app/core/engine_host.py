@@ -0,0 +1,197 @@
+import os
+import signal
+import asyncio
+import threading
+from multiprocessing.connection import Listener, Client, Connection
+from typing import Any, Callable, Dict, Tuple
+
+from app.core.shared_ring import SharedFrameRing
+from app.core.telemetry_frame import encode_telemetry_frame
+
+# ==========================================
+# DEPLOYMENT SETTINGS (shared by the engine host and the API workers)
+# ==========================================
+# One engine process owns the simulation; `uvicorn api_worker:app --workers N` serves the API from it.
+RING_NAME = os.getenv("OMEGA_RING_NAME", "omega_engine_ring")
+RING_SLOTS = int(os.getenv("OMEGA_RING_SLOTS", "8"))
+RING_SLOT_BYTES = int(os.getenv("OMEGA_RING_SLOT_BYTES", str(4 << 20)))  # Floor; grown to fit the grid at startup
+ENGINE_ADDRESS = os.getenv("OMEGA_ENGINE_ADDRESS", "127.0.0.1:7700")
+# Shared secret for the command channel (launch.sh generates one per deployment). There is deliberately no
+# default: the channel unpickles what it receives, so a guessable key would let any local process run code.
+ENGINE_AUTHKEY_ENV = "OMEGA_ENGINE_AUTHKEY"
+PUBLISHED_LOG_LINES = 200  # system_state logs carried in each frame (the full list stays in the engine)
+ALERT_BYTES = 96           # Worst-case JSON size of one alert in the frame header
+LOG_LINE_BYTES = 512       # Allowance per published log line
+
+
+def parse_address(address: str) -> Tuple[str, int] | str:
+    """'host:port' -> TCP address; anything else is treated as a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    return (host, int(port)) if sep and port.isdigit() else address
+
+
+def engine_authkey() -> bytes:
+    """The command-channel key from OMEGA_ENGINE_AUTHKEY; the engine and its workers refuse to start without one."""
+    key = os.getenv(ENGINE_AUTHKEY_ENV, "")
+    if not key:
+        raise Exception(f"Critical Error: {ENGINE_AUTHKEY_ENV} is not set. Export the same random secret to the "
+                        "engine host and every API worker (launch.sh generates one).")
+    return key.encode()
+
+
+# ==========================================
+# COMMAND CHANNEL
+# ==========================================
+class CommandServer:
+    def __init__(self, handler: Callable[[Dict[str, Any]], Dict[str, Any]], address: str = ENGINE_ADDRESS,
+                 authkey: bytes | None = None):
+        """
+        Accepts authenticated connections from API workers. Each connection gets a thread that answers its
+        requests in order with `handler(request) -> response`; a failing request returns a 500-style reply.
+        """
+        self.handler = handler
+        self.listener = Listener(parse_address(address), authkey=authkey or engine_authkey())
+        self._thread = threading.Thread(target=self._accept_loop, name="omega-command-server", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        print(f"[ENGINE] Command channel listening on {self.listener.address}.")
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                return  # Listener closed
+            except Exception as e:
+                print(f"[ENGINE] Rejected command connection: {e}")
+                continue
+            threading.Thread(target=self._serve, args=(conn,), name="omega-command-conn", daemon=True).start()
+
+    def _serve(self, conn: Connection):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    response = self.handler(request)
+                except Exception as e:
+                    response = {"status": 500, "headers": {"content-type": "application/json"},
+                                "body": f'{{"detail": "Engine command failed: {type(e).__name__}"}}'.encode()}
+                conn.send(response)
+
+    def close(self):
+        self.listener.close()
+
+
+class EngineClient:
+    def __init__(self, address: str = ENGINE_ADDRESS, authkey: bytes | None = None):
+        """Worker side of the command channel; one connection per calling thread (connections are not thread-safe)."""
+        self.address = parse_address(address)
+        self.authkey = authkey or engine_authkey()
+        self._local = threading.local()
+
+    def _connection(self) -> Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            conn = Client(self.address, authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Sends one request and waits for the engine's reply (reconnecting once if the engine restarted)."""
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send(request)
+                return conn.recv()
+            except (EOFError, OSError, ConnectionError):
+                self._local.conn = None
+                if attempt:
+                    raise
+        raise ConnectionError("Engine command channel unavailable.")
+
+
+# ==========================================
+# ENGINE HOST
+# ==========================================
+def build_snapshot_frame(orch, system_state: Dict[str, Any], alerts: list) -> bytes:
+    """The per-tick frame workers serve from: columnar telemetry (with scores) plus alerts and system state."""
+    system = dict(system_state, logs=system_state["logs"][-PUBLISHED_LOG_LINES:])
+    meta = {"tick": orch.ticks, "grid_size": orch.grid.grid_size, "alerts": alerts, "system": system}
+    return encode_telemetry_frame(orch.snapshot(), meta=meta)
+
+
+def slot_size_for(orch, floor: int = RING_SLOT_BYTES) -> int:
+    """
+    Ring slot size that holds a frame of this grid with every node alerting and full log lines,
+    with 2x headroom for agent reports in system_state. Never below `floor`.
+    """
+    columns_only = len(build_snapshot_frame(orch, {"logs": []}, alerts=[]))
+    worst_case = columns_only + orch.grid.num_nodes * ALERT_BYTES + PUBLISHED_LOG_LINES * LOG_LINE_BYTES
+    return max(floor, 2 * worst_case)
+
+
+def run_engine_host():
+    """
+    Runs the full api_server engine (physics loop, cortex, agents, approvals, checkpoints, ingestion) in this
+    process, publishes a frame to the shared ring after every tick, and executes requests forwarded by workers
+    against the in-process app, so all state changes happen in exactly one place.
+    """
+    engine_authkey()  # Fail before booting the engine rather than when the command channel opens
+    import httpx
+    import api_server
+
+    slot_size = slot_size_for(api_server.orch)
+    ring = SharedFrameRing.create(RING_NAME, slots=RING_SLOTS, slot_size=slot_size)
+
+    def publish(telemetry, alerts):
+        try:
+            ring.publish(build_snapshot_frame(api_server.orch, api_server.system_state, alerts))
+        except ValueError as e:
+            # Workers see the drop counter (GET /engine reports stale); log once per stale run, not every tick
+            ring.record_drop()
+            if ring.frames_behind == 1:
+                print(f"[ENGINE] Snapshot not published, workers are serving a stale frame: {e}")
+
+    api_server.tick_listeners.append(publish)
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api_server.app), base_url="http://engine")
+
+    async def forward(request: Dict[str, Any]) -> Dict[str, Any]:
+        response = await client.request(request["method"], request["path"], params=request.get("query"),
+                                        content=request.get("body") or None, headers=request.get("headers"))
+        return {"status": response.status_code, "headers": {"content-type": response.headers.get("content-type", "")},
+                "body": response.content}
+
+    server = CommandServer(lambda request: asyncio.run_coroutine_threadsafe(forward(request), loop).result())
+    stop = asyncio.Event()
+
+    async def serve():
+        # The app's own lifespan runs the startup (engine loop, warm-up) and shutdown (final checkpoint) hooks
+        async with api_server.app.router.lifespan_context(api_server.app):
+            server.start()
+            print(f"[ENGINE] Publishing snapshots to shared memory '{RING_NAME}' ({RING_SLOTS} x {slot_size} bytes).")
+            await stop.wait()
+            server.close()
+        await client.aclose()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        loop.run_until_complete(serve())
+    finally:
+        # The physics loop task created by the startup hook runs forever; cancel it before closing the loop
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        ring.close()
+        loop.close()
+
+
+if __name__ == "__main__":
+    run_engine_host()
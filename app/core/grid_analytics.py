@@ -0,0 +1,100 @@
+import numpy as np
+from typing import Dict, Any, Sequence
+
+# Columns a node table can be sorted by
+SORTABLE_FIELDS = ['node_id', 'network_latency_ms', 'resource_capacity_pct', 'threat_level', 'x', 'y', 'anomaly_score']
+# Upper bound on tiles per grid side (tile arrays are per_side^2 long)
+MAX_TILES_PER_SIDE = 1000
+
+
+def _tile_index(columns: dict, tile_m: float, grid_size: float) -> tuple:
+    """Assigns every node to a square spatial tile. Returns (flat tile index, tiles per side)."""
+    if not tile_m > 0:
+        raise ValueError(f"Tile size must be positive, got {tile_m}.")
+    per_side = max(1, int(np.ceil(grid_size / tile_m)))
+    if per_side > MAX_TILES_PER_SIDE:
+        raise ValueError(f"Tile size {tile_m}m is too fine: at least {grid_size / MAX_TILES_PER_SIDE:g}m for this grid.")
+    tx = np.clip((np.asarray(columns['x']) // tile_m).astype(np.int64), 0, per_side - 1)
+    ty = np.clip((np.asarray(columns['y']) // tile_m).astype(np.int64), 0, per_side - 1)
+    return ty * per_side + tx, per_side
+
+
+def tile_heatmap(columns: dict, tile_m: float = 100.0, grid_size: float = 1000.0) -> Dict[str, Any]:
+    """
+    Spatially bins a snapshot into square tiles (one vectorized bincount per statistic).
+    Only occupied tiles are returned: node count, mean latency, max threat and compromised count per tile.
+    """
+    flat, per_side = _tile_index(columns, tile_m, grid_size)
+    n_tiles = per_side * per_side
+    latency = np.asarray(columns['network_latency_ms'], dtype=np.float64)
+    threat = np.asarray(columns['threat_level'], dtype=np.float64)
+    compromised = np.asarray(columns['status']) == 'COMPROMISED'
+
+    count = np.bincount(flat, minlength=n_tiles)
+    latency_sum = np.bincount(flat, weights=latency, minlength=n_tiles)
+    compromised_count = np.bincount(flat, weights=compromised, minlength=n_tiles)
+    threat_max = np.zeros(n_tiles)
+    np.maximum.at(threat_max, flat, threat)
+
+    occupied = np.flatnonzero(count)
+    return {
+        "tile_m": tile_m,
+        "x_center": ((occupied % per_side) + 0.5) * tile_m,
+        "y_center": ((occupied // per_side) + 0.5) * tile_m,
+        "count": count[occupied],
+        "latency_mean_ms": latency_sum[occupied] / count[occupied],
+        "threat_max": threat_max[occupied],
+        "compromised": compromised_count[occupied].astype(np.int64)
+    }
+
+
+def region_latency_quantiles(columns: dict, region_m: float = 250.0, grid_size: float = 1000.0,
+                             quantiles: Sequence[float] = (0.5, 0.9, 0.99)) -> Dict[str, Any]:
+    """
+    Latency quantiles per square region, computed for all regions at once:
+    one lexsort by (region, latency), then linear interpolation at each group's quantile positions.
+    """
+    region, per_side = _tile_index(columns, region_m, grid_size)
+    latency = np.asarray(columns['network_latency_ms'], dtype=np.float64)
+
+    order = np.lexsort((latency, region))
+    sorted_latency, sorted_region = latency[order], region[order]
+    regions, starts, counts = np.unique(sorted_region, return_index=True, return_counts=True)
+
+    result = {"region_m": region_m, "region": regions, "x_center": ((regions % per_side) + 0.5) * region_m,
+              "y_center": ((regions // per_side) + 0.5) * region_m, "count": counts}
+    for q in quantiles:
+        pos = starts + q * (counts - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, starts + counts - 1)
+        frac = pos - lo
+        result[f"p{int(round(q * 100))}"] = sorted_latency[lo] * (1 - frac) + sorted_latency[hi] * frac
+    return result
+
+
+def node_page(columns: dict, page: int = 0, page_size: int = 50, sort_by: str = 'threat_level',
+              descending: bool = True) -> Dict[str, Any]:
+    """One page of the node table, sorted server-side with a single argsort over the snapshot."""
+    if sort_by not in SORTABLE_FIELDS or sort_by not in columns:
+        raise ValueError(f"Cannot sort by '{sort_by}'. Choose one of {[f for f in SORTABLE_FIELDS if f in columns]}.")
+    key = np.asarray(columns[sort_by])
+    order = np.argsort(-key if descending else key, kind="stable")
+    rows = order[page * page_size:(page + 1) * page_size]
+
+    page_columns = {name: np.asarray(values)[rows] for name, values in columns.items()}
+    return {"total": int(len(key)), "page": page, "page_size": page_size, "sort_by": sort_by, "rows": page_columns}
+
+
+def to_json_ready(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Converts numpy arrays/scalars in an analytics payload to plain lists and numbers."""
+    ready = {}
+    for key, value in payload.items():
+        if isinstance(value, dict):
+            ready[key] = to_json_ready(value)
+        elif isinstance(value, np.ndarray):
+            ready[key] = value.tolist()
+        elif isinstance(value, np.generic):
+            ready[key] = value.item()
+        else:
+            ready[key] = value
+    return ready
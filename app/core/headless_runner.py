@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+from typing import Any, Dict, Optional
+
+from app.core.orchestrator import OmegaOrchestrator
+
+
+class HeadlessRunner:
+    def __init__(self, orchestrator: OmegaOrchestrator, dt: float = 1.0, score_every: int = 1,
+                 out_dir: str = "./omega_headless", score_batch: int = 512):
+        """
+        Steps the orchestrator as fast as the CPU allows on a simulated clock (no sleeps, no API, no UI).
+        - dt: Simulated seconds per tick.
+        - score_every: Run the ML cortex on every k-th tick only (physics and history still advance every tick).
+        - score_batch: Sampled snapshots are scored together in one model pass. Nothing in the simulation reacts
+          to the scores, so deferring inference changes no result and amortizes the per-call model overhead.
+        - out_dir: Scored ticks are streamed to `<out_dir>/results.ndjson`, the run summary to `summary.json`.
+        """
+        if dt <= 0 or score_every < 1:
+            raise ValueError("dt must be positive and score_every at least 1.")
+        self.orch = orchestrator
+        self.dt = dt
+        self.score_every = score_every
+        self.score_batch = score_batch
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _score_pending(self, pending: list, out, totals: Dict[str, Any]):
+        """Scores buffered (tick, sim_ts, columns) samples in one cortex call and streams one line per tick."""
+        if not pending:
+            return
+        features = self.orch.ml_cortex.feature_names
+        stacked = {f: np.concatenate([cols[f] for _, _, cols in pending]) for f in features}
+        is_anomaly, scores = self.orch.ml_cortex.score_columns(stacked)
+
+        lines, offset = [], 0
+        for tick, sim_ts, cols in pending:
+            n = len(cols['node_id'])
+            tick_flags, tick_scores = is_anomaly[offset:offset + n], scores[offset:offset + n]
+            flagged = cols['node_id'][tick_flags]
+            np.add.at(totals["flagged_per_node"], flagged, 1)
+            totals["alerts"] += len(flagged)
+            lines.append(json.dumps({
+                "tick": tick,
+                "sim_ts": round(sim_ts, 3),
+                "flagged": flagged.tolist(),
+                "min_score": round(float(tick_scores.min()), 4),
+                "mean_score": round(float(tick_scores.mean()), 4)
+            }))
+            offset += n
+        out.write("\n".join(lines) + "\n")
+        totals["scored_ticks"] += len(pending)
+        pending.clear()
+
+    def run(self, duration_s: float, start_ts: Optional[float] = None, progress_every_s: float = 3600.0) -> Dict[str, Any]:
+        """Simulates `duration_s` seconds starting at unix time `start_ts` (now by default). Returns the run summary."""
+        if not self.orch.ml_cortex.is_trained:
+            self.orch.ml_cortex.train_baseline()
+
+        sim_start = time.time() if start_ts is None else start_ts
+        num_ticks = int(np.ceil(duration_s / self.dt))
+        results_path = os.path.join(self.out_dir, "results.ndjson")
+        sampled_fields = ['node_id'] + self.orch.ml_cortex.feature_names
+
+        totals = {"scored_ticks": 0, "alerts": 0, "flagged_per_node": np.zeros(self.orch.grid.num_nodes, dtype=np.int64)}
+        pending = []
+        next_progress = progress_every_s
+        wall_start = time.perf_counter()
+
+        with open(results_path, "w") as out:
+            for tick in range(1, num_ticks + 1):
+                sim_ts = sim_start + tick * self.dt
+                self.orch.run_cycle(dt=self.dt, now=sim_ts, score=False)
+
+                if tick % self.score_every == 0:
+                    snapshot = self.orch.latest_snapshot
+                    pending.append((tick, sim_ts, {f: snapshot[f] for f in sampled_fields}))
+                    if len(pending) >= self.score_batch:
+                        self._score_pending(pending, out, totals)
+
+                if tick * self.dt >= next_progress:
+                    print(f"[HEADLESS] {tick * self.dt / 3600:.1f}h simulated in {time.perf_counter() - wall_start:.1f}s wall")
+                    next_progress += progress_every_s
+
+            self._score_pending(pending, out, totals)
+
+        self.orch.history.flush()
+        wall_s = time.perf_counter() - wall_start
+        summary = {
+            "simulated_s": num_ticks * self.dt,
+            "wall_s": round(wall_s, 3),
+            "speedup": round(num_ticks * self.dt / wall_s, 1) if wall_s > 0 else None,
+            "ticks": num_ticks,
+            "dt": self.dt,
+            "score_every": self.score_every,
+            "scored_ticks": totals["scored_ticks"],
+            "alerts": totals["alerts"],
+            "alert_rate_per_node": (totals["flagged_per_node"] / max(1, totals["scored_ticks"])).round(4).tolist(),
+            "sim_start_ts": sim_start,
+            "results": results_path
+        }
+        with open(os.path.join(self.out_dir, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+
+# --- Quick Lab Test / CLI ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the City-Omega simulation headless on a simulated clock.")
+    parser.add_argument("--hours", type=float, default=24.0, help="Simulated hours to run")
+    parser.add_argument("--dt", type=float, default=1.0, help="Simulated seconds per tick")
+    parser.add_argument("--score-every", type=int, default=10, help="Run the ML cortex every k ticks")
+    parser.add_argument("--nodes", type=int, default=5, help="Grid size")
+    parser.add_argument("--out", default="./omega_headless", help="Output directory")
+    args = parser.parse_args()
+
+    # History gets its own store so a headless day never overwrites the live server's rollups
+    orch = OmegaOrchestrator(num_nodes=args.nodes, history_root=os.path.join(args.out, "history"))
+    runner = HeadlessRunner(orch, dt=args.dt, score_every=args.score_every, out_dir=args.out)
+
+    print(f"\n[HEADLESS] Simulating {args.hours}h (dt={args.dt}s, scoring every {args.score_every} ticks)...")
+    summary = runner.run(args.hours * 3600)
+    print(f"[HEADLESS] Done: {summary['simulated_s']:.0f}s simulated in {summary['wall_s']}s wall "
+          f"({summary['speedup']}x real time), {summary['alerts']} alerts -> {summary['results']}")
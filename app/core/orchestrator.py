@@ -1,29 +1,188 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from typing import Dict, List
+
 from app.simulation.city_grid import CityConnectGrid
 from app.ml.predictive_cortex import PredictiveCortex
 from app.core.veto_protocol import VetoProtocol
+from app.core.approval_broker import ApprovalBroker
+from app.core.telemetry_history import TelemetryHistory
+from app.core.grid_tenancy import DEFAULT_GRID, GridTenant, score_batch, validate_grid_id
 
 class OmegaOrchestrator:
-    def __init__(self):
-        self.grid = CityConnectGrid(num_nodes=5)
+    def __init__(self, pretrain: bool = True, approvals: ApprovalBroker | None = None, num_nodes: int = 5,
+                 history_root: str = "./omega_history", grid_workers: int = 4, round_budget_s: float = 0.1):
+        """
+        Hosts any number of independent grids (see GridTenant) keyed by id around ONE shared ML cortex.
+        The "default" grid is created here and is what .grid/.history/.run_cycle() refer to.
+        - grid_workers: Worker pool size for physics ticks when several grids are due at once.
+        - round_budget_s: How long a scheduler round waits for started ticks before scoring what finished.
+        """
         self.ml_cortex = PredictiveCortex()
-        self.governance = VetoProtocol()
-        
-        # Pre-train the ML model on boot
-        self.ml_cortex.train_baseline()
-
-    def run_cycle(self):
-        """A single operational second in the city grid."""
-        # 1. Update Physics
-        self.grid.tick_physics_engine()
-        
-        # 2. Ingest Telemetry
-        telemetry = self.grid.fetch_live_telemetry()
-        
-        # 3. ML Anomaly Detection Loop
-        alerts = []
-        for node_id, data in telemetry.items():
-            analysis = self.ml_cortex.analyze_live_telemetry(node_id, data['telemetry'])
-            if analysis['is_anomaly']:
-                alerts.append(analysis)
-        
-        return telemetry, alerts
\ No newline at end of file
+        # Vetoes are queued on the broker (surfaced over the API) instead of blocking on terminal input
+        self.approvals = approvals or ApprovalBroker()
+        self.governance = VetoProtocol(broker=self.approvals)
+        self.history_root = history_root
+        self.grid_workers = grid_workers
+        self.round_budget_s = round_budget_s
+
+        self.tenants: Dict[str, GridTenant] = {}
+        self._tenants_lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._pool = None
+        self.add_grid(DEFAULT_GRID, num_nodes=num_nodes)
+
+        # Pre-train the ML model on boot (fast-start hosts defer this to a background thread)
+        if pretrain:
+            self.ml_cortex.train_baseline()
+
+    # ==========================================
+    # DEFAULT GRID (single-grid callers)
+    # ==========================================
+    @property
+    def default(self) -> GridTenant:
+        return self.tenants[DEFAULT_GRID]
+
+    @property
+    def grid(self) -> CityConnectGrid:
+        return self.default.grid
+
+    @property
+    def history(self) -> TelemetryHistory:
+        return self.default.history
+
+    @property
+    def latest_snapshot(self):
+        return self.default.latest_snapshot
+
+    @property
+    def ticks(self) -> int:
+        """Completed cycles of the default grid; checkpoints are taken between them."""
+        return self.default.ticks
+
+    @ticks.setter
+    def ticks(self, value: int):
+        self.default.ticks = value
+
+    # ==========================================
+    # GRID REGISTRY
+    # ==========================================
+    def add_grid(self, grid_id: str, num_nodes: int = 5, tick_interval_s: float = 0.5, dt: float = 1.0) -> GridTenant:
+        """Creates and registers a grid. Raises ValueError for an invalid or already used id."""
+        validate_grid_id(grid_id)
+        if num_nodes < 1:
+            raise ValueError("A grid needs at least one node.")
+        with self._tenants_lock:
+            if grid_id in self.tenants:
+                raise ValueError(f"Grid '{grid_id}' already exists.")
+        # Each grid keeps its own history rings; the default grid keeps the pre-tenancy location
+        root = self.history_root if grid_id == DEFAULT_GRID else os.path.join(self.history_root, "grids", grid_id)
+        grid = CityConnectGrid(num_nodes=num_nodes)
+        tenant = GridTenant(grid_id, grid, TelemetryHistory(num_nodes=num_nodes, root=root),
+                            tick_interval_s=tick_interval_s, dt=dt)
+        with self._tenants_lock:
+            if grid_id in self.tenants:
+                raise ValueError(f"Grid '{grid_id}' already exists.")
+            self.tenants[grid_id] = tenant
+        return tenant
+
+    def remove_grid(self, grid_id: str) -> GridTenant:
+        """Unregisters a grid (a tick still in flight finishes and is discarded). The default grid stays."""
+        if grid_id == DEFAULT_GRID:
+            raise ValueError("The default grid cannot be removed.")
+        with self._tenants_lock:
+            return self.tenants.pop(grid_id)
+
+    def tenant(self, grid_id: str) -> GridTenant:
+        """Raises KeyError for an unknown grid."""
+        return self.tenants[grid_id]
+
+    # ==========================================
+    # TICKING
+    # ==========================================
+    def run_cycle(self, dt: float = 1.0, now: float | None = None, score: bool = True):
+        """
+        A single operational step of `dt` seconds in the default grid.
+        `now` overrides the wall-clock timestamp (simulated clocks); `score=False` skips ML inference for this step.
+        """
+        # 1. Update Physics and read the grid, retained in the rollup store
+        #    (externally ingested batches land between ticks, never mid-tick)
+        telemetry, columns = self.default.advance(dt=dt, now=now)
+        self.approvals.expire_overdue()  # Default decisions for approvals past their deadline
+
+        # 2. ML Anomaly Detection, one batch for the whole grid (skipped until the cortex has finished training)
+        alerts = score_batch(self.ml_cortex, [columns])[0] if score else []
+
+        # Latest columnar snapshot, served to the aggregation endpoints without re-walking the graph
+        self.default.publish(telemetry, columns, alerts)
+        return telemetry, alerts
+
+    def run_due_grids(self, score: bool = True) -> Dict[str, tuple]:
+        """
+        One scheduler round across every hosted grid:
+        1. grids whose tick is due start on the worker pool, most overdue first. A grid never has two ticks in
+           flight, and a grid that fell behind skips its missed slots instead of bursting, so one slow or
+           fast-ticking district cannot starve the others;
+        2. the round waits up to `round_budget_s` for started ticks (slow ones carry over to the next round);
+        3. every tick that finished is scored in ONE shared cortex batch and published.
+        Returns {grid_id: (telemetry, alerts)} for the grids that completed a tick (telemetry is only read
+        out for the default grid).
+        """
+        clock = time.monotonic()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.grid_workers, thread_name_prefix="omega-grid")
+
+        with self._tenants_lock:
+            due = sorted((t for gid, t in self.tenants.items() if gid not in self._inflight and t.next_due <= clock),
+                         key=lambda t: t.next_due)
+            for tenant in due:
+                tenant.lag_s = clock - tenant.next_due if tenant.ticks else 0.0
+                next_due = tenant.next_due + tenant.tick_interval_s
+                tenant.next_due = next_due if next_due > clock else clock + tenant.tick_interval_s
+                self._inflight[tenant.grid_id] = self._pool.submit(
+                    tenant.advance, with_telemetry=tenant.grid_id == DEFAULT_GRID)
+            pending = list(self._inflight.values())
+
+        if pending:
+            wait(pending, timeout=self.round_budget_s)
+
+        finished = []
+        with self._tenants_lock:
+            for grid_id, future in list(self._inflight.items()):
+                if not future.done():
+                    continue
+                del self._inflight[grid_id]
+                tenant = self.tenants.get(grid_id)
+                if tenant is None:
+                    continue  # Removed while its tick was running
+                try:
+                    telemetry, columns = future.result()
+                except Exception as e:
+                    print(f"[SYSTEM] Grid '{grid_id}' tick failed: {e}")
+                    continue
+                finished.append((tenant, telemetry, columns))
+
+        self.approvals.expire_overdue()
+        alerts = score_batch(self.ml_cortex, [c for _, _, c in finished]) if score else [[] for _ in finished]
+
+        results = {}
+        for (tenant, telemetry, columns), grid_alerts in zip(finished, alerts):
+            tenant.publish(telemetry, columns, grid_alerts)
+            results[tenant.grid_id] = (telemetry, grid_alerts)
+        return results
+
+    def snapshot(self, grid_id: str = DEFAULT_GRID) -> dict:
+        """Columnar telemetry from the grid's last completed cycle (taken live if no cycle has run yet)."""
+        return self.tenant(grid_id).snapshot()
+
+    def grid_status(self) -> List[dict]:
+        with self._tenants_lock:
+            return [t.status() for t in self.tenants.values()]
+
+    def close(self):
+        """Stops the grid worker pool (pending ticks are dropped)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
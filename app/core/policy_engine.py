@@ -0,0 +1,149 @@
+import numpy as np
+from typing import Any, Dict, List
+
+# Interval operators: rule value -> (low, high, low_inclusive, high_inclusive)
+_INTERVAL_OPS = {
+    "gt": lambda v: (v, np.inf, False, True),
+    "ge": lambda v: (v, np.inf, True, True),
+    "lt": lambda v: (-np.inf, v, True, False),
+    "le": lambda v: (-np.inf, v, True, True),
+    "between": lambda v: (v[0], v[1], True, True),
+}
+_SET_OPS = ("in", "not_in")
+INVALID_FIELD = "INVALID_FIELD"  # Reason code for a present numeric field that cannot be parsed (always vetoed)
+
+
+def _as_float(value: Any) -> float:
+    """Numeric view of an action field; missing or non-numeric values (e.g. 'node-7') become NaN (see INVALID_FIELD)."""
+    try:
+        return np.nan if value is None else float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class _ActionFields(dict):
+    """Leaves unknown placeholders intact when formatting a rule message."""
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+class _CompiledRule:
+    def __init__(self, spec: Dict[str, Any]):
+        self.code = spec["code"]
+        self.field = spec["field"]
+        self.op = spec["op"]
+        self.message = spec.get("message", spec["code"])
+        self.default = spec.get("default")
+
+        if self.op in _SET_OPS:
+            values = list(spec["values"])
+            self.numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values)
+            # Numeric sets become a sorted array for vectorized membership; label sets stay a hash set
+            self.index = np.unique(np.asarray(values, dtype=np.float64)) if self.numeric else frozenset(values)
+        elif self.op in _INTERVAL_OPS:
+            self.numeric = True
+            self.interval = _INTERVAL_OPS[self.op](spec["value"])
+        else:
+            raise ValueError(f"Unsupported policy operator '{self.op}' in rule {self.code}.")
+
+    def evaluate(self, column) -> np.ndarray:
+        if self.op in _SET_OPS:
+            if self.numeric:
+                hit = np.isin(column, self.index)
+            else:
+                # Membership is decided once per distinct label, then broadcast back to every action
+                labels, inverse = np.unique(np.asarray(column, dtype=str), return_inverse=True)
+                hit = np.fromiter((label in self.index for label in labels), dtype=bool, count=len(labels))[inverse]
+            return ~hit if self.op == "not_in" else hit
+
+        low, high, low_inclusive, high_inclusive = self.interval
+        above = column >= low if low_inclusive else column > low
+        below = column <= high if high_inclusive else column < high
+        return above & below  # NaN compares False: an absent field skips the rule (unparseable ones are vetoed)
+
+
+class PolicyEngine:
+    def __init__(self, policies: List[Dict[str, Any]]):
+        """
+        Declarative governance rules compiled into set and interval indexes.
+        `policies` is ordered by precedence: when several rules fire, the first one supplies the reason code.
+        Each rule: {'code', 'field', 'op' (in/not_in/gt/ge/lt/le/between), 'values' or 'value', 'message', 'default'}.
+        Messages may reference action fields, e.g. "Action '{action}' is strictly restricted."
+        """
+        self.rules = [_CompiledRule(spec) for spec in policies]
+
+    def _column(self, rule: _CompiledRule, actions: List[Dict[str, Any]]):
+        """Returns (column, invalid): `invalid` marks values that are present but not numeric for a numeric rule."""
+        raw = [a.get(rule.field, rule.default) for a in actions]
+        if rule.numeric:
+            column = np.fromiter((_as_float(v) for v in raw), dtype=np.float64, count=len(raw))
+            present = np.fromiter((v is not None for v in raw), dtype=bool, count=len(raw))
+            return column, present & np.isnan(column)
+        return np.asarray(["" if v is None else str(v) for v in raw], dtype=str), np.zeros(len(raw), dtype=bool)
+
+    def _evaluate(self, actions: List[Dict[str, Any]]):
+        """(fired rules x actions matrix, {field: invalid mask}) in one vectorized pass per rule."""
+        fired = np.zeros((len(self.rules), len(actions)), dtype=bool)
+        columns, invalid = {}, {}
+        for i, rule in enumerate(self.rules):
+            key = (rule.field, rule.numeric)
+            if key not in columns:
+                columns[key], bad = self._column(rule, actions)
+                if bad.any():
+                    invalid[rule.field] = invalid.get(rule.field, False) | bad
+            fired[i] = rule.evaluate(columns[key])
+        return fired, invalid
+
+    def evaluate_matrix(self, actions: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Boolean (rules x actions) matrix of fired rules, one vectorized pass per rule.
+        Fails closed: a numeric rule counts as fired when its field is present but unparseable.
+        """
+        fired, invalid = self._evaluate(actions)
+        for i, rule in enumerate(self.rules):
+            if rule.numeric and rule.field in invalid:
+                fired[i] |= invalid[rule.field]
+        return fired
+
+    def evaluate_batch(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Screens many proposed actions at once (each a flat dict such as
+        {'action': ..., 'target_node': ..., 'estimated_cost': ...}).
+        Returns one decision per action: requires_veto, the winning reason_code/reason and every fired code.
+        A numeric field that is present but unparseable (e.g. estimated_cost "$8,000") cannot be checked,
+        so it fails closed with reason code INVALID_FIELD, ahead of every rule.
+        """
+        if not actions:
+            return []
+        fired, invalid = self._evaluate(actions)
+        fields = list(invalid)
+        bad_fields = np.array([invalid[f] for f in fields], dtype=bool).reshape(len(fields), len(actions))
+        requires_veto = fired.any(axis=0) | bad_fields.any(axis=0)
+        winner = fired.argmax(axis=0)
+
+        decisions = []
+        for j, action in enumerate(actions):
+            if not requires_veto[j]:
+                decisions.append({"requires_veto": False, "reason_code": None, "reason": "", "codes": []})
+                continue
+            codes = [self.rules[i].code for i in np.flatnonzero(fired[:, j])]
+            unparsed = [fields[k] for k in np.flatnonzero(bad_fields[:, j])]
+            if unparsed:
+                decisions.append({
+                    "requires_veto": True,
+                    "reason_code": INVALID_FIELD,
+                    "reason": "Non-numeric value for " + ", ".join(f"{f}={action.get(f)!r}" for f in unparsed) + ".",
+                    "codes": [INVALID_FIELD] + codes
+                })
+                continue
+            rule = self.rules[winner[j]]
+            decisions.append({
+                "requires_veto": True,
+                "reason_code": rule.code,
+                "reason": rule.message.format_map(_ActionFields(action)),
+                "codes": codes
+            })
+        return decisions
+
+    def evaluate(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        return self.evaluate_batch([action])[0]
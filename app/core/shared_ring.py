@@ -0,0 +1,138 @@
+import struct
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from typing import Any, Callable, Optional
+
+_MAGIC = b"OMGR"
+_VERSION = 2
+_HEADER = struct.Struct("<4sHHQ")  # magic, version, slot count, slot size
+_HEADER_SIZE = 64                  # header + published-sequence and dropped-frame counters, padded to a cache line
+_SLOT_META = 16                    # per slot: sequence (uint64), frame length (uint64)
+
+
+class RingReadTimeout(Exception):
+    """Raised when a reader keeps losing the race against the writer (slot overwritten mid-read)."""
+
+
+class SharedFrameRing:
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """
+        Single-writer, many-reader ring of serialized frames in shared memory.
+        The engine publishes one frame per tick into the next slot; API workers in other processes map the same
+        segment and read the newest frame in place. Every slot carries a sequence word used as a seqlock:
+        odd while the writer is filling it, 2n once frame n is complete. A reader checks the word before and after
+        using the bytes and retries if it changed, so readers never block the writer and never take a lock.
+        """
+        self.shm = shm
+        self.owner = owner
+        magic, version, self.slots, self.slot_size = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Shared memory segment '{shm.name}' is not an Omega frame ring (v{_VERSION}).")
+        self._head = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=_HEADER.size)
+        # [frames dropped in total, frames dropped since the last successful publish]
+        self._drops = np.ndarray((2,), dtype=np.uint64, buffer=shm.buf, offset=_HEADER.size + 8)
+        stride = _SLOT_META + self.slot_size
+        self._slot_meta = [np.ndarray((2,), dtype=np.uint64, buffer=shm.buf, offset=_HEADER_SIZE + i * stride)
+                           for i in range(self.slots)]
+        self._slot_data = [shm.buf[_HEADER_SIZE + i * stride + _SLOT_META:_HEADER_SIZE + (i + 1) * stride]
+                           for i in range(self.slots)]
+
+    @classmethod
+    def create(cls, name: str, slots: int = 8, slot_size: int = 4 << 20) -> "SharedFrameRing":
+        """Allocates the segment (engine side), replacing a stale one left behind by a crashed engine."""
+        size = _HEADER_SIZE + slots * (_SLOT_META + slot_size)
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, _VERSION, slots, slot_size)
+        np.ndarray((3,), dtype=np.uint64, buffer=shm.buf, offset=_HEADER.size)[:] = 0
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrameRing":
+        """Maps an existing segment (worker side)."""
+        shm = shared_memory.SharedMemory(name=name)
+        # Readers must not unlink the engine's segment when they exit (the resource tracker would on 3.11)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    @property
+    def sequence(self) -> int:
+        """Number of frames published so far."""
+        return int(self._head[0])
+
+    @property
+    def frames_behind(self) -> int:
+        """Frames the writer could not publish since the last one it did; non-zero means readers see stale data."""
+        return int(self._drops[1])
+
+    @property
+    def dropped_frames(self) -> int:
+        return int(self._drops[0])
+
+    def record_drop(self):
+        """Writer side: a frame was skipped (e.g. too large), so the newest slot is now stale."""
+        self._drops[0] += 1
+        self._drops[1] += 1
+
+    def publish(self, frame: bytes) -> int:
+        """Writes the next frame (single writer only). Returns its sequence number."""
+        if len(frame) > self.slot_size:
+            raise ValueError(f"Frame of {len(frame)} bytes exceeds the ring slot size ({self.slot_size}).")
+        n = self.sequence + 1
+        slot = n % self.slots
+        meta = self._slot_meta[slot]
+        meta[0] = 2 * n - 1                    # Odd: slot is being written
+        self._slot_data[slot][:len(frame)] = frame
+        meta[1] = len(frame)
+        meta[0] = 2 * n                        # Even: frame n is complete
+        self._head[0] = n
+        self._drops[1] = 0
+        return n
+
+    def read(self, consume: Callable[[memoryview], Any], retries: int = 16) -> Optional[Any]:
+        """
+        Runs `consume` on the newest frame in place (no copy) and returns its result, or None before the first
+        publish. `consume` must finish with the view (copy out anything it keeps): the result is only
+        returned if the slot was not overwritten while it ran.
+        """
+        for _ in range(retries):
+            n = self.sequence
+            if n == 0:
+                return None
+            meta = self._slot_meta[n % self.slots]
+            before = int(meta[0])
+            if before != 2 * n:
+                continue  # Lapped by the writer between reading the head and the slot; take the new head
+            view = self._slot_data[n % self.slots][:int(meta[1])]
+            try:
+                result = consume(view)
+            except Exception:
+                if int(meta[0]) == before:
+                    raise
+                continue  # Torn read decoded as garbage; the seqlock says retry
+            finally:
+                view.release()
+            if int(meta[0]) == before:
+                return result
+        raise RingReadTimeout(f"Could not read a stable frame after {retries} attempts.")
+
+    def latest_bytes(self) -> Optional[bytes]:
+        """Copy of the newest frame (for handing to a socket or HTTP response)."""
+        return self.read(bytes)
+
+    def close(self):
+        """Detaches; the owning engine also removes the segment."""
+        self._head = None
+        self._drops = None
+        self._slot_meta = []
+        for view in self._slot_data:
+            view.release()
+        self._slot_data = []
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
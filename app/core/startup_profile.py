@@ -0,0 +1,43 @@
+import time
+import threading
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    def __init__(self, budget_s: float = 2.0):
+        """
+        Records how long each boot phase takes, measured from profiler creation.
+        `budget_s` is the target for the process to start serving /telemetry.
+        """
+        self.budget_s = budget_s
+        self._t0 = time.perf_counter()
+        self._phases = {}
+        self._marks = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._phases[name] = {
+                    "started_at_s": round(start - self._t0, 4),
+                    "duration_s": round(time.perf_counter() - start, 4)
+                }
+
+    def mark(self, name: str):
+        """Records a point-in-time milestone (e.g. 'serving') relative to process boot."""
+        with self._lock:
+            self._marks[name] = round(time.perf_counter() - self._t0, 4)
+
+    def report(self) -> dict:
+        with self._lock:
+            serving = self._marks.get("serving")
+            return {
+                "phases": dict(self._phases),
+                "milestones": dict(self._marks),
+                "budget_s": self.budget_s,
+                "within_budget": serving is not None and serving <= self.budget_s
+            }
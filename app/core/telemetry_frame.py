@@ -0,0 +1,94 @@
+import json
+import struct
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Tuple
+
+# Content-negotiated media type for the columnar telemetry representation.
+FRAME_MEDIA_TYPE = "application/vnd.omega.telemetry-frame"
+
+_MAGIC = b"OMGF"
+_VERSION = 1
+_PREAMBLE = struct.Struct("<4sHHI")  # magic, version, reserved, header length
+_ALIGNMENT = 8
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def pack_columns(columns: Dict[str, np.ndarray], meta: Dict[str, Any] | None = None) -> bytes:
+    """
+    Packs named 1-D numpy arrays into a single binary frame.
+    Layout: fixed preamble, JSON header describing each column, then every column as a
+    contiguous little-endian typed array aligned to 8 bytes so readers can map it without copying.
+    """
+    arrays = {}
+    layout = []
+    offset = 0
+    for name, values in columns.items():
+        arr = np.ascontiguousarray(values)
+        if arr.dtype.kind not in "biuf":
+            raise TypeError(f"Column '{name}' has non-numeric dtype {arr.dtype}; encode it before packing.")
+        arr = arr.astype(arr.dtype.newbyteorder("<"), copy=False)
+        offset = _aligned(offset)
+        layout.append({"name": name, "dtype": arr.dtype.str, "length": int(arr.shape[0]), "offset": offset})
+        arrays[name] = arr
+        offset += arr.nbytes
+
+    header = json.dumps({"columns": layout, "meta": meta or {}}, separators=(",", ":")).encode("utf-8")
+    body_start = _aligned(_PREAMBLE.size + len(header))
+
+    frame = bytearray(body_start + offset)
+    _PREAMBLE.pack_into(frame, 0, _MAGIC, _VERSION, 0, len(header))
+    frame[_PREAMBLE.size:_PREAMBLE.size + len(header)] = header
+    for col in layout:
+        start = body_start + col["offset"]
+        frame[start:start + arrays[col["name"]].nbytes] = arrays[col["name"]].tobytes()
+    return bytes(frame)
+
+
+def unpack_columns(buffer) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Reverses pack_columns. Arrays are zero-copy views over `buffer` (bytes, memoryview or mmap),
+    so they stay valid only as long as the buffer does.
+    """
+    view = memoryview(buffer)
+    magic, version, _, header_len = _PREAMBLE.unpack_from(view, 0)
+    if magic != _MAGIC:
+        raise ValueError("Not an Omega telemetry frame (bad magic).")
+    if version != _VERSION:
+        raise ValueError(f"Unsupported telemetry frame version {version}.")
+
+    header = json.loads(bytes(view[_PREAMBLE.size:_PREAMBLE.size + header_len]))
+    body_start = _aligned(_PREAMBLE.size + header_len)
+
+    columns = {}
+    for col in header["columns"]:
+        columns[col["name"]] = np.frombuffer(
+            view, dtype=np.dtype(col["dtype"]), count=col["length"], offset=body_start + col["offset"]
+        )
+    return columns, header["meta"]
+
+
+def encode_telemetry_frame(columns: Dict[str, Any], meta: Dict[str, Any] | None = None) -> bytes:
+    """
+    Encodes grid telemetry columns (see CityConnectGrid.telemetry_columns) into a frame.
+    The string 'status' column is dictionary-encoded to uint8 codes; the category table rides in the header.
+    """
+    packed = dict(columns)
+    meta = dict(meta or {})
+    if "status" in packed:
+        categories, codes = np.unique(np.asarray(packed["status"], dtype=str), return_inverse=True)
+        packed["status"] = codes.astype(np.uint8)
+        meta["status_categories"] = categories.tolist()
+    return pack_columns(packed, meta)
+
+
+def decode_telemetry_frame(buffer) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Decodes a telemetry frame straight into a DataFrame (one row per node) plus its metadata."""
+    columns, meta = unpack_columns(buffer)
+    df = pd.DataFrame(columns)
+    if "status" in df and "status_categories" in meta:
+        df["status"] = pd.Categorical.from_codes(df["status"].to_numpy(), categories=meta.pop("status_categories"))
+    return df, meta
@@ -0,0 +1,170 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+# Fields retained over time (positions/velocities are not worth the disk)
+HISTORY_FIELDS = ['network_latency_ms', 'resource_capacity_pct', 'threat_level']
+
+# (tier name, bucket width in seconds, number of buckets kept) -> 1h of 1s, 1 day of 1m, 30 days of 1h
+DEFAULT_TIERS = [("1s", 1, 3600), ("1m", 60, 1440), ("1h", 3600, 720)]
+
+_STATS = ("min", "max", "mean")
+
+
+class _RollupTier:
+    """
+    One downsampling tier: a fixed-size ring of buckets living in memory-mapped files.
+    Each bucket stores min/max/mean for every (node, field) pair. Writes only ever append the
+    newest bucket (overwriting the oldest slot), so disk usage is constant once the ring is full.
+    """
+
+    def __init__(self, root: str, name: str, width_s: int, capacity: int, num_nodes: int, num_fields: int):
+        self.name = name
+        self.width_s = width_s
+        self.capacity = capacity
+        shape = (capacity, num_nodes, num_fields, len(_STATS))
+
+        values_path = os.path.join(root, f"{name}.values.bin")
+        index_path = os.path.join(root, f"{name}.index.bin")
+        fresh = not (os.path.exists(values_path) and os.path.exists(index_path))
+
+        self.values = np.memmap(values_path, dtype=np.float32, mode="w+" if fresh else "r+", shape=shape)
+        # Absolute bucket number (timestamp // width) held by each slot, -1 for never written
+        self.index = np.memmap(index_path, dtype=np.int64, mode="w+" if fresh else "r+", shape=(capacity,))
+        if fresh:
+            self.index[:] = -1
+
+        # In-memory accumulator for the bucket currently being filled
+        self._bucket = None
+        self._min = np.full((num_nodes, num_fields), np.inf)
+        self._max = np.full((num_nodes, num_fields), -np.inf)
+        self._sum = np.zeros((num_nodes, num_fields))
+        self._count = np.zeros((num_nodes, 1))
+
+    def accumulate(self, ts: float, mins: np.ndarray, maxs: np.ndarray, sums: np.ndarray, counts: np.ndarray, rows: np.ndarray):
+        """Folds pre-aggregated samples for `rows` into the open bucket. Returns the closed bucket, if any."""
+        bucket = int(ts // self.width_s)
+        closed = None
+        if self._bucket is not None and bucket != self._bucket:
+            closed = self._close()
+        self._bucket = bucket
+
+        np.minimum.at(self._min, rows, mins)
+        np.maximum.at(self._max, rows, maxs)
+        np.add.at(self._sum, rows, sums)
+        np.add.at(self._count, rows, counts)
+        return closed
+
+    def _close(self):
+        """Writes the open bucket into its ring slot and resets the accumulator."""
+        seen = self._count[:, 0] > 0
+        mean = np.divide(self._sum, self._count, out=np.full_like(self._sum, np.nan), where=self._count > 0)
+        slot = self._bucket % self.capacity
+        self.values[slot, :, :, 0] = np.where(seen[:, None], self._min, np.nan)
+        self.values[slot, :, :, 1] = np.where(seen[:, None], self._max, np.nan)
+        self.values[slot, :, :, 2] = mean
+        self.index[slot] = self._bucket
+
+        closed = (self._bucket * self.width_s, self._min.copy(), self._max.copy(), self._sum.copy(), self._count.copy(), seen)
+        self._bucket = None
+        self._min.fill(np.inf)
+        self._max.fill(-np.inf)
+        self._sum.fill(0.0)
+        self._count.fill(0.0)
+        return closed
+
+    def read(self, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (bucket start timestamps, values) for closed buckets overlapping [start, end], oldest first."""
+        lo, hi = int(start // self.width_s), int(end // self.width_s)
+        slots = np.flatnonzero((self.index >= lo) & (self.index <= hi))
+        order = np.argsort(self.index[slots])
+        slots = slots[order]
+        return self.index[slots] * self.width_s, np.asarray(self.values[slots])
+
+    def flush(self):
+        self.values.flush()
+        self.index.flush()
+
+
+class TelemetryHistory:
+    def __init__(self, num_nodes: int, root: str = "./omega_history", tiers: List[Tuple[str, int, int]] = None):
+        """
+        Embedded time-series store for per-node telemetry.
+        Raw samples are rolled up into 1s buckets, which cascade into 1m and 1h buckets (min/max/mean).
+        Every tier is a bounded ring in a memory-mapped file, so memory and disk stay flat while
+        operators still get hours (1s), a day (1m) and a month (1h) of history.
+        """
+        self.root = root
+        self.num_nodes = num_nodes
+        self.fields = list(HISTORY_FIELDS)
+        tiers = tiers or DEFAULT_TIERS
+        os.makedirs(root, exist_ok=True)
+        self._reset_if_layout_changed(tiers)
+
+        self.tiers = [_RollupTier(root, name, width, cap, num_nodes, len(self.fields)) for name, width, cap in tiers]
+
+    def _reset_if_layout_changed(self, tiers):
+        """Drops old ring files when the node count or tier layout no longer matches what is on disk."""
+        layout = {"num_nodes": self.num_nodes, "fields": self.fields, "tiers": [list(t) for t in tiers]}
+        layout_path = os.path.join(self.root, "layout.json")
+        if os.path.exists(layout_path):
+            with open(layout_path) as f:
+                if json.load(f) == layout:
+                    return
+            for name in os.listdir(self.root):
+                if name.endswith(".bin"):
+                    os.remove(os.path.join(self.root, name))
+        with open(layout_path, "w") as f:
+            json.dump(layout, f)
+
+    def append(self, ts: float, columns: Dict[str, np.ndarray]):
+        """Ingests one telemetry snapshot (see CityConnectGrid.telemetry_columns) taken at unix time `ts`."""
+        rows = np.asarray(columns['node_id'], dtype=np.int64)
+        keep = rows < self.num_nodes
+        rows = rows[keep]
+        samples = np.column_stack([np.asarray(columns[f], dtype=np.float64)[keep] for f in self.fields])
+
+        closed = self.tiers[0].accumulate(ts, samples, samples, samples, np.ones((len(rows), 1)), rows)
+        # A closed bucket in one tier becomes a single pre-aggregated sample for the next tier up
+        for tier in self.tiers[1:]:
+            if closed is None:
+                break
+            bucket_ts, mins, maxs, sums, counts, seen = closed
+            seen_rows = np.flatnonzero(seen)
+            closed = tier.accumulate(bucket_ts, mins[seen_rows], maxs[seen_rows], sums[seen_rows], counts[seen_rows], seen_rows)
+
+    def select_tier(self, resolution_s: float) -> _RollupTier:
+        """Picks the coarsest tier whose bucket width still satisfies the requested resolution."""
+        eligible = [t for t in self.tiers if t.width_s <= resolution_s]
+        return max(eligible, key=lambda t: t.width_s) if eligible else self.tiers[0]
+
+    def query(self, start: float, end: float, resolution_s: float = 1.0, node_id: int | None = None) -> pd.DataFrame:
+        """
+        Range query over [start, end] (unix seconds). Returns one row per (bucket, node) with
+        '<field>_min', '<field>_max' and '<field>_mean' columns, served from the coarsest adequate tier.
+        """
+        if node_id is not None and not 0 <= node_id < self.num_nodes:
+            raise ValueError(f"Unknown node_id {node_id}: this grid has nodes 0..{self.num_nodes - 1}.")
+        tier = self.select_tier(resolution_s)
+        timestamps, values = tier.read(start, end)
+
+        nodes = np.arange(self.num_nodes) if node_id is None else np.asarray([node_id])
+        values = values[:, nodes]  # (buckets, nodes, fields, stats)
+        frame = {
+            "timestamp": np.repeat(timestamps, len(nodes)),
+            "node_id": np.tile(nodes, len(timestamps)),
+        }
+        for f_idx, field in enumerate(self.fields):
+            for s_idx, stat in enumerate(_STATS):
+                frame[f"{field}_{stat}"] = values[:, :, f_idx, s_idx].reshape(-1)
+
+        df = pd.DataFrame(frame)
+        df.attrs["tier"] = tier.name
+        # Nodes that reported nothing inside a bucket have NaN rollups; drop them
+        return df.dropna(subset=[f"{self.fields[0]}_mean"])
+
+    def flush(self):
+        for tier in self.tiers:
+            tier.flush()
@@ -1,47 +1,78 @@
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional
+
+from app.core.policy_engine import PolicyEngine
 
 class VetoProtocol:
-    def __init__(self):
+    def __init__(self, broker=None, policies: Optional[List[Dict[str, Any]]] = None, verbose: bool = False):
         """
         The deterministic governance layer for City Connect Omega.
         Prevents Agentic AI from executing catastrophic real-world commands.
+        With an ApprovalBroker attached, flagged actions are queued for asynchronous human approval
+        instead of blocking the calling thread on terminal input.
         """
+        self.broker = broker
+        self.verbose = verbose
         # Define strict thresholds. If an agent exceeds these, execution is frozen.
         self.MAX_AUTONOMOUS_SPEND = 5000.00
         self.CRITICAL_NODES = [0, 1] # e.g., command centers that cannot be autonomously shut down
         self.RESTRICTED_ACTIONS = ['SHUTDOWN_GRID', 'DEPLOY_COUNTERMEASURES', 'REROUTE_ALL']
 
+        # The thresholds above are compiled into a declarative rule engine (custom policies replace them)
+        self.policies = policies or self.default_policies()
+        self.engine = PolicyEngine(self.policies)
+
+    def default_policies(self) -> List[Dict[str, Any]]:
+        """The safety matrix as declarative rules, highest precedence first."""
+        return [
+            {"code": "CRITICAL_NODE", "field": "target_node", "op": "in", "values": self.CRITICAL_NODES,
+             "message": "Interferes with Tier-1 Critical Node {target_node}."},
+            {"code": "RESTRICTED_ACTION", "field": "action", "op": "in", "values": self.RESTRICTED_ACTIONS,
+             "message": "Action '{action}' is strictly restricted."},
+            {"code": "SPEND_LIMIT", "field": "estimated_cost", "op": "gt", "value": self.MAX_AUTONOMOUS_SPEND, "default": 0,
+             "message": f"Exceeds max autonomous spend limit (${self.MAX_AUTONOMOUS_SPEND})"}
+        ]
+
     def evaluate_agent_action(self, agent_name: str, proposed_action: str, parameters: Dict[str, Any]) -> bool:
         """
         Interrogates the agent's proposed action against the safety matrix.
         Returns True if safe to auto-execute, False if it requires a Human Veto.
         """
-        print(f"\n[GOVERNANCE] Analyzing proposed action from {agent_name}...")
-        
-        requires_veto = False
-        trigger_reason = ""
+        if self.verbose:
+            print(f"\n[GOVERNANCE] Analyzing proposed action from {agent_name}...")
+        decision = self.engine.evaluate(dict(parameters, action=proposed_action))
 
-        # 1. Check Financial/Resource Limits
-        if parameters.get('estimated_cost', 0) > self.MAX_AUTONOMOUS_SPEND:
-            requires_veto = True
-            trigger_reason = f"Exceeds max autonomous spend limit (${self.MAX_AUTONOMOUS_SPEND})"
+        if decision["requires_veto"]:
+            return self._trigger_human_override(agent_name, proposed_action, parameters, decision["reason"])
+        
+        if self.verbose:
+            print("[GOVERNANCE] Action cleared for autonomous execution.")
+        return True
 
-        # 2. Check Restricted Actions
-        if proposed_action in self.RESTRICTED_ACTIONS:
-            requires_veto = True
-            trigger_reason = f"Action '{proposed_action}' is strictly restricted."
+    def evaluate_batch(self, proposed_actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Screens a batch of candidate actions (each {'action': ..., **parameters}) in one vectorized pass.
+        Pure classification: returns a decision per action with a structured reason code and never prompts.
+        """
+        return self.engine.evaluate_batch(proposed_actions)
 
-        # 3. Check Critical Infrastructure Impact
-        if parameters.get('target_node') in self.CRITICAL_NODES:
-            requires_veto = True
-            trigger_reason = f"Interferes with Tier-1 Critical Node {parameters.get('target_node')}."
+    def request_authorization(self, agent_name: str, proposed_action: str, parameters: Dict[str, Any],
+                              on_decision: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Non-blocking counterpart of evaluate_agent_action (requires a broker).
+        Returns {'status': 'CLEARED'} for safe actions, otherwise queues an approval and returns
+        {'status': 'PENDING', 'approval_id': ..., 'deadline': ...}; `on_decision` fires once it is resolved.
+        """
+        decision = self.engine.evaluate(dict(parameters, action=proposed_action))
+        if not decision["requires_veto"]:
+            return {"status": "CLEARED"}
+        if self.broker is None:
+            raise Exception("Critical Error: asynchronous authorization requires an ApprovalBroker.")
 
-        if requires_veto:
-            return self._trigger_human_override(agent_name, proposed_action, parameters, trigger_reason)
-        
-        print("[GOVERNANCE] Action cleared for autonomous execution.")
-        return True
+        approval = self.broker.submit(agent_name, proposed_action, parameters, decision["reason"], on_decision=on_decision)
+        print(f"[GOVERNANCE] SAFE-STOP queued as approval {approval['id']}: {decision['reason']}")
+        return {"status": "PENDING", "approval_id": approval["id"], "deadline": approval["deadline"],
+                "reason_code": decision["reason_code"], "reason": decision["reason"]}
 
     def _trigger_human_override(self, agent_name: str, action: str, params: Dict, reason: str) -> bool:
         """Pauses the system thread and requests explicit terminal input."""
@@ -66,7 +97,7 @@ class VetoProtocol:
 
 # --- Quick Lab Test ---
 if __name__ == "__main__":
-    governance = VetoProtocol()
+    governance = VetoProtocol(verbose=True)
     
     # Safe action (Will auto-execute)
     safe_params = {'target_node': 5, 'estimated_cost': 1200}
@@ -74,4 +105,9 @@ if __name__ == "__main__":
     
     # Dangerous action (Will trigger the prompt)
     dangerous_params = {'target_node': 0, 'estimated_cost': 8000}
-    governance.evaluate_agent_action("Executive_Agent", "DEPLOY_COUNTERMEASURES", dangerous_params)
\ No newline at end of file
+    governance.evaluate_agent_action("Executive_Agent", "DEPLOY_COUNTERMEASURES", dangerous_params)
+
+    # Planner-scale batch screening (no prompts, structured reason codes)
+    candidates = [{'action': 'REROUTE_SUPPLIES', 'target_node': n % 10, 'estimated_cost': 1000.0 * (n % 8)} for n in range(10000)]
+    decisions = governance.evaluate_batch(candidates)
+    print(f"Batch screened {len(decisions)} actions, {sum(d['requires_veto'] for d in decisions)} require a veto.")
\ No newline at end of file
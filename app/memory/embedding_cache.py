@@ -0,0 +1,149 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace and case so trivially different anomaly descriptions share one embedding."""
+    return " ".join(text.lower().split())
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = 4096):
+        """Thread-safe least-recently-used map with a hard entry cap."""
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CachedEmbedder:
+    def __init__(self, embed_fn: Optional[Callable[[List[str]], List[Any]]] = None, max_entries: int = 4096):
+        """
+        Memoizes text embeddings keyed by the hash of the normalized text.
+        Only cache misses reach the embedding model, and they are embedded in a single batch.
+        """
+        self._embed_fn = embed_fn
+        self.cache = LRUCache(max_entries)
+
+    def _model(self):
+        if self._embed_fn is None:
+            # Same model ChromaDB uses by default, so cached vectors match documents already on disk
+            from chromadb.utils import embedding_functions
+            self._embed_fn = embedding_functions.DefaultEmbeddingFunction()
+        return self._embed_fn
+
+    def embed(self, texts: List[str]) -> List[Any]:
+        keys = [text_key(t) for t in texts]
+        vectors = [self.cache.get(k) for k in keys]
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            fresh = self._model()([normalize_text(texts[i]) for i in missing])
+            for i, vector in zip(missing, fresh):
+                self.cache.put(keys[i], vector)
+                vectors[i] = vector
+        return vectors
+
+
+class MemoizedCollection:
+    def __init__(self, collection, embedder: CachedEmbedder, query_ttl_s: float = 5.0,
+                 batch_size: int = 32, flush_interval_s: float = 2.0):
+        """
+        Wraps a ChromaDB collection with cached embeddings, a short-TTL query result cache and batched writes.
+        Any write bumps the collection generation, which invalidates every cached query result.
+        """
+        self.collection = collection
+        self.embedder = embedder
+        self.query_ttl_s = query_ttl_s
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+
+        self._results = LRUCache(max_entries=1024)
+        self._generation = 0
+        self._pending: Dict[str, list] = {"documents": [], "metadatas": [], "ids": []}
+        self._lock = threading.RLock()
+        self._flush_timer = None
+
+    def query(self, query_texts: List[str], n_results: int = 1) -> Dict[str, Any]:
+        self.flush()  # read-your-writes: buffered signatures must be visible to the lookup
+        key = (tuple(text_key(t) for t in query_texts), n_results)
+
+        cached = self._results.get(key)
+        now = time.monotonic()
+        if cached is not None:
+            expires_at, generation, result = cached
+            if generation == self._generation and now < expires_at:
+                return result
+
+        generation = self._generation
+        result = self.collection.query(query_embeddings=self.embedder.embed(query_texts), n_results=n_results)
+        self._results.put(key, (now + self.query_ttl_s, generation, result))
+        return result
+
+    def add(self, documents: List[str], metadatas: List[Dict[str, Any]], ids: List[str]):
+        """Buffers documents; they are embedded and written in one batch when the buffer fills or the timer fires."""
+        with self._lock:
+            self._pending["documents"].extend(documents)
+            self._pending["metadatas"].extend(metadatas)
+            self._pending["ids"].extend(ids)
+            if len(self._pending["ids"]) >= self.batch_size:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval_s, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending["ids"]:
+                return
+            batch, self._pending = self._pending, {"documents": [], "metadatas": [], "ids": []}
+            self.collection.add(embeddings=self.embedder.embed(batch["documents"]), **batch)
+            self._generation += 1
+
+    def count(self) -> int:
+        self.flush()
+        return self.collection.count()
+
+    def invalidate(self):
+        """Drops every cached query result (after writes that bypass add(), e.g. update/delete)."""
+        with self._lock:
+            self._generation += 1
+
+    def __getattr__(self, name):
+        # Anything not memoized falls through to the underlying collection
+        return getattr(self.collection, name)
@@ -0,0 +1,101 @@
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+# Usage counters kept on every learned memory's metadata
+HIT_COUNT = "hit_count"
+MERGED_COUNT = "merged_count"
+FIRST_SEEN_AT = "first_seen_at"
+LAST_HIT_AT = "last_hit_at"
+PINNED = "pinned"
+
+
+def to_cosine_distance(distance: float, space: str = "l2") -> float:
+    """Converts a ChromaDB distance to cosine distance (embeddings from the default model are unit length)."""
+    if space == "l2":
+        return distance / 2.0  # squared L2 between unit vectors = 2 - 2cos
+    return distance            # 'cosine' and 'ip' already report 1 - similarity
+
+
+def usage_scores(metadatas: List[Dict[str, Any]], now: float, half_life_s: float) -> np.ndarray:
+    """Hit count decayed by time since the last hit: frequently *and* recently used memories score highest."""
+    hits = np.fromiter((m.get(HIT_COUNT, 1) for m in metadatas), dtype=np.float64, count=len(metadatas))
+    last = np.fromiter((m.get(LAST_HIT_AT, m.get(FIRST_SEEN_AT, now)) for m in metadatas), dtype=np.float64, count=len(metadatas))
+    return hits * np.power(0.5, np.maximum(now - last, 0.0) / half_life_s)
+
+
+def cluster_near_duplicates(embeddings: np.ndarray, merge_distance: float, priority: np.ndarray,
+                            pinned: np.ndarray) -> np.ndarray:
+    """
+    Leader clustering on cosine distance. Entries are visited in `priority` order; each unassigned entry becomes
+    a leader and absorbs every unassigned entry within `merge_distance` of it. Pinned entries are never absorbed.
+    Returns, for every row, the row index of its cluster leader.
+    """
+    unit = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    leader = np.full(len(unit), -1, dtype=np.int64)
+    for idx in priority:
+        if leader[idx] != -1:
+            continue
+        candidates = np.flatnonzero((leader == -1) & ~pinned)
+        close = candidates[1.0 - unit[candidates] @ unit[idx] <= merge_distance]
+        leader[close] = idx
+        leader[idx] = idx
+    return leader
+
+
+def plan_compaction(ids: List[str], embeddings: np.ndarray, metadatas: List[Optional[Dict[str, Any]]],
+                    pending_hits: Dict[str, Dict[str, float]], now: float, merge_distance: float, max_entries: int,
+                    pinned_ids: set = frozenset(), half_life_s: float = 30 * 86400.0) -> Dict[str, Any]:
+    """
+    Works out one compaction pass without touching the store:
+    1. folds buffered search hits into each entry's counters,
+    2. merges near-duplicate clusters into their most-used member (summing hit and merge counts),
+    3. evicts the least-used unpinned survivors until at most `max_entries` remain.
+    Returns {'update_ids', 'update_metadatas', 'delete_ids', 'merged', 'evicted'}.
+    """
+    metadatas = [dict(m or {}) for m in metadatas]
+    for meta, memory_id in zip(metadatas, ids):
+        meta.setdefault(HIT_COUNT, 1)
+        meta.setdefault(MERGED_COUNT, 1)
+        meta.setdefault(FIRST_SEEN_AT, now)
+        hits = pending_hits.get(memory_id)
+        if hits:
+            meta[HIT_COUNT] += int(hits["count"])
+            meta[LAST_HIT_AT] = max(meta.get(LAST_HIT_AT, 0.0), hits["last_at"])
+        if memory_id in pinned_ids:
+            meta[PINNED] = True
+
+    if not ids:
+        return {"update_ids": [], "update_metadatas": [], "delete_ids": [], "merged": 0, "evicted": 0}
+
+    pinned = np.fromiter((bool(m.get(PINNED)) for m in metadatas), dtype=bool, count=len(ids))
+    usage = usage_scores(metadatas, now, half_life_s)
+    priority = np.lexsort((-usage, ~pinned))  # Pinned first, then most used
+
+    leader = cluster_near_duplicates(np.asarray(embeddings, dtype=np.float64), merge_distance, priority, pinned)
+    for member in np.flatnonzero(leader != np.arange(len(ids))):
+        head, absorbed = metadatas[leader[member]], metadatas[member]
+        head[HIT_COUNT] += absorbed[HIT_COUNT]
+        head[MERGED_COUNT] += absorbed[MERGED_COUNT]
+        head[FIRST_SEEN_AT] = min(head[FIRST_SEEN_AT], absorbed[FIRST_SEEN_AT])
+        if LAST_HIT_AT in absorbed:
+            head[LAST_HIT_AT] = max(head.get(LAST_HIT_AT, 0.0), absorbed[LAST_HIT_AT])
+
+    survivors = np.flatnonzero(leader == np.arange(len(ids)))
+    merged = set(np.flatnonzero(leader != np.arange(len(ids))).tolist())
+
+    # Capacity: drop the lowest decayed-usage unpinned survivors
+    evicted = set()
+    overflow = len(survivors) - max_entries
+    if overflow > 0:
+        usage = usage_scores(metadatas, now, half_life_s)
+        evictable = survivors[~pinned[survivors]]
+        evicted = set(evictable[np.argsort(usage[evictable], kind="stable")][:overflow].tolist())
+
+    kept = [i for i in survivors.tolist() if i not in evicted]
+    return {
+        "update_ids": [ids[i] for i in kept],
+        "update_metadatas": [metadatas[i] for i in kept],
+        "delete_ids": [ids[i] for i in sorted(merged | evicted)],
+        "merged": len(merged),
+        "evicted": len(evicted)
+    }
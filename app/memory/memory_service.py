@@ -0,0 +1,204 @@
+import sys
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.memory.embedding_cache import CachedEmbedder, MemoizedCollection
+from app.memory.memory_compaction import (HIT_COUNT, MERGED_COUNT, FIRST_SEEN_AT, LAST_HIT_AT, PINNED,
+                                          plan_compaction, to_cosine_distance)
+
+# Pre-seeded "experience" so the Oracle has historical defense logs to draw from on its first run
+SEED_SIGNATURES = {
+    "documents": [
+        "Node status COMPROMISED. High network latency > 500ms. Resource capacity dropped below 20%.",
+        "Node status COMPROMISED. Zero network latency. Resource capacity at 0%."
+    ],
+    "metadatas": [
+        {"anomaly": "DDoS_ATTACK", "proven_countermeasure": "Isolate node from swarm routing and reboot firewall.", PINNED: True},
+        {"anomaly": "POWER_FAILURE", "proven_countermeasure": "Reroute power from adjacent grid and dispatch physical maintenance drone.", PINNED: True}
+    ],
+    "ids": ["incident_alpha", "incident_beta"]
+}
+
+
+def ensure_modern_sqlite():
+    """ChromaDB needs a newer sqlite3 than many system Pythons ship; swap in pysqlite3 before importing it."""
+    if getattr(sys.modules.get('sqlite3'), '__name__', '') == 'pysqlite3':
+        return
+    try:
+        __import__('pysqlite3')
+        sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+    except ImportError:
+        pass
+
+
+class VectorMemoryService:
+    def __init__(self, path: str = "./omega_memory", collection_name: str = "threat_signatures",
+                 merge_distance: float = 0.06, max_entries: int = 500):
+        """
+        Single owner of the Episodic Vector Memory (ChromaDB client, collection handle and embedding cache).
+        Nothing is loaded at construction; the client connects on first use or via warm_up_async().
+        - merge_distance: Cosine distance under which two signatures count as the same incident.
+        - max_entries: Capacity cap enforced by compact(); the least-used unpinned memories are evicted.
+        """
+        self.path = path
+        self.collection_name = collection_name
+        self.merge_distance = merge_distance
+        self.max_entries = max_entries
+        self.embedder = CachedEmbedder()
+        self._collection = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+        # Retrieval hits are counted in memory and folded into metadata by the maintenance pass
+        self._hits: Dict[str, Dict[str, float]] = {}
+        self._hits_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._maintenance_stop = threading.Event()
+        self.last_compaction: Optional[Dict[str, Any]] = None
+
+    @property
+    def collection(self) -> MemoizedCollection:
+        if self._collection is None:
+            with self._lock:
+                if self._collection is None:
+                    self._collection = self._connect()
+        return self._collection
+
+    def _connect(self) -> MemoizedCollection:
+        print("[SYSTEM] Booting Episodic Vector Memory Cortex...")
+        ensure_modern_sqlite()
+        import chromadb
+
+        # PersistentClient ensures the AI remembers past runs even if you restart the server
+        client = chromadb.PersistentClient(path=self.path)
+        collection = MemoizedCollection(client.get_or_create_collection(name=self.collection_name), self.embedder)
+
+        if collection.count() == 0:
+            print("[SYSTEM] First boot detected. Seeding Vector DB with historical defense logs...")
+            collection.add(**SEED_SIGNATURES)
+            collection.flush()
+        return collection
+
+    def warm_up(self):
+        """Connects and forces the embedding model to load so the first real lookup is fast."""
+        try:
+            self.collection
+            self.embedder.embed(["warm-up probe"])
+            print("[SYSTEM] Vector Memory Cortex warm. Embedding model loaded.")
+        except Exception as e:
+            print(f"[ERROR] Vector Memory warm-up failed: {e}")
+        finally:
+            self._ready.set()
+
+    def warm_up_async(self) -> threading.Thread:
+        thread = threading.Thread(target=self.warm_up, name="vector-memory-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def search(self, description: str, n_results: int = 1) -> Dict[str, Any]:
+        results = self.collection.query(query_texts=[description], n_results=n_results)
+        self.record_hits(results["ids"][0] if results.get("ids") else [])
+        return results
+
+    def record_hits(self, memory_ids: List[str]):
+        now = time.time()
+        with self._hits_lock:
+            for memory_id in memory_ids:
+                entry = self._hits.setdefault(memory_id, {"count": 0, "last_at": now})
+                entry["count"] += 1
+                entry["last_at"] = now
+
+    def nearest(self, signature: str) -> Optional[tuple]:
+        """(memory id, cosine distance) of the closest stored signature, or None for an empty memory."""
+        results = self.collection.query(query_texts=[signature], n_results=1)
+        if not results.get("ids") or not results["ids"][0]:
+            return None
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        return results["ids"][0][0], to_cosine_distance(results["distances"][0][0], space)
+
+    def learn(self, signature: str, metadata: Dict[str, Any], memory_id: str) -> str:
+        """
+        Stores an approved signature. A near-duplicate of an existing memory reinforces that memory (one more hit)
+        instead of adding another document. Returns the id of the memory that now holds the signature.
+        """
+        match = self.nearest(signature)
+        if match is not None and match[1] <= self.merge_distance:
+            self.record_hits([match[0]])
+            return match[0]
+
+        now = time.time()
+        metadata = dict(metadata, **{HIT_COUNT: 1, MERGED_COUNT: 1, FIRST_SEEN_AT: now, LAST_HIT_AT: now})
+        self.collection.add(documents=[signature], metadatas=[metadata], ids=[memory_id])
+        return memory_id
+
+    # ==========================================
+    # MAINTENANCE
+    # ==========================================
+    def compact(self) -> Dict[str, Any]:
+        """
+        One maintenance pass: folds buffered hit counts into metadata, merges near-duplicate signatures into
+        their most-used member and evicts the least-used memories above max_entries. Seeds are never removed.
+        """
+        with self._compact_lock:
+            start = time.perf_counter()
+            collection = self.collection
+            collection.flush()
+            with self._hits_lock:
+                hits, self._hits = self._hits, {}
+
+            stored = collection.get(include=["embeddings", "metadatas"])
+            plan = plan_compaction(stored["ids"], stored["embeddings"], stored["metadatas"], hits, time.time(),
+                                   self.merge_distance, self.max_entries, pinned_ids=set(SEED_SIGNATURES["ids"]))
+            if plan["update_ids"]:
+                collection.update(ids=plan["update_ids"], metadatas=plan["update_metadatas"])
+            if plan["delete_ids"]:
+                collection.delete(ids=plan["delete_ids"])
+            collection.invalidate()
+
+            self.last_compaction = {
+                "before": len(stored["ids"]),
+                "after": len(stored["ids"]) - len(plan["delete_ids"]),
+                "merged": plan["merged"],
+                "evicted": plan["evicted"],
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+                "at": time.time()
+            }
+            return self.last_compaction
+
+    def start_maintenance(self, interval_s: float = 3600.0) -> threading.Thread:
+        """Background compaction every `interval_s` seconds (runs only once the memory is warm)."""
+        def loop():
+            while not self._maintenance_stop.wait(interval_s):
+                if not self.is_ready():
+                    continue
+                try:
+                    report = self.compact()
+                    print(f"[SYSTEM] Vector Memory compacted: {report['before']} -> {report['after']} entries "
+                          f"({report['merged']} merged, {report['evicted']} evicted) in {report['elapsed_ms']}ms.")
+                except Exception as e:
+                    print(f"[ERROR] Vector Memory compaction failed: {e}")
+
+        thread = threading.Thread(target=loop, name="vector-memory-maintenance", daemon=True)
+        thread.start()
+        return thread
+
+    def stop_maintenance(self):
+        self._maintenance_stop.set()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_memory_service() -> VectorMemoryService:
+    """Process-wide shared memory service; every agent and endpoint goes through the same client."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = VectorMemoryService()
+    return _service
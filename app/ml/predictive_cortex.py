@@ -1,16 +1,18 @@
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import IsolationForest
 import random
+import pickle
 
 class PredictiveCortex:
     def __init__(self):
         """
         Initializes the unsupervised ML engine.
         contamination=0.05 tells the model to expect about 5% of edge-case noise in normal data.
+        scikit-learn is only imported when the model is first trained, keeping construction cheap.
         """
-        self.model = IsolationForest(n_estimators=100, contamination=0.05, random_state=42)
+        self.model = None
         self.is_trained = False
+        self.model_version = 0  # Bumped on every (re)training so checkpoints only re-serialize changed weights
         self.feature_names = ['network_latency_ms', 'resource_capacity_pct', 'threat_level']
 
     def train_baseline(self):
@@ -27,10 +29,30 @@ class PredictiveCortex:
         df = pd.DataFrame(data, columns=self.feature_names)
         
         print("[ML CORTEX] Training Isolation Forest algorithm...")
+        if self.model is None:
+            from sklearn.ensemble import IsolationForest
+            self.model = IsolationForest(n_estimators=100, contamination=0.05, random_state=42)
         self.model.fit(df)
         self.is_trained = True
+        self.model_version += 1
         print("[ML CORTEX] Model weights locked. Ready for sub-millisecond inference.")
 
+    def export_model(self) -> bytes:
+        """Serialized model weights (empty until trained)."""
+        return pickle.dumps(self.model, protocol=pickle.HIGHEST_PROTOCOL) if self.is_trained else b""
+
+    def load_model(self, blob: bytes):
+        """
+        Restores weights written by export_model, skipping the retraining pass.
+        The blob is unpickled: only pass weights from a trusted source (e.g. the engine's own checkpoint dir).
+        """
+        if not blob:
+            return
+        self.model = pickle.loads(blob)
+        self.is_trained = True
+        self.model_version += 1
+        print("[ML CORTEX] Model weights restored from checkpoint. Ready for inference.")
+
     def analyze_live_telemetry(self, node_id: int, telemetry: dict) -> dict:
         """
         Ingests live telemetry from a single node and predicts if it is experiencing a zero-day anomaly.
@@ -59,6 +81,22 @@ class PredictiveCortex:
             "anomaly_score": round(float(score), 4)
         }
 
+    def score_columns(self, columns: dict) -> tuple:
+        """
+        Scores a whole telemetry snapshot (see CityConnectGrid.telemetry_columns) in one model pass.
+        Returns (is_anomaly bool array, anomaly_score float array), aligned with columns['node_id'].
+        """
+        if not self.is_trained:
+            raise Exception("Critical Error: ML Cortex must be trained before inference.")
+
+        live_data = pd.DataFrame({f: np.asarray(columns[f], dtype=np.float64) for f in self.feature_names})
+        if live_data.empty:
+            return np.zeros(0, dtype=bool), np.zeros(0)
+
+        # IsolationForest flags exactly the samples whose decision function is negative
+        scores = self.model.decision_function(live_data)
+        return scores < 0, scores
+
 # --- Quick Lab Test ---
 if __name__ == "__main__":
     # 1. Boot and train the model
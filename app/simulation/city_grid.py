@@ -1,12 +1,30 @@
 import networkx as nx
+import numpy as np
 import random
-import math
+import threading
+from app.simulation.threat_diffusion import ThreatDiffusion
+
+# Numeric per-node telemetry fields, in the column order used by bulk exports.
+TELEMETRY_FIELDS = ['network_latency_ms', 'resource_capacity_pct', 'threat_level', 'x', 'y', 'velocity_x', 'velocity_y']
+
+# Telemetry each anomaly drives a node towards at full intensity. 'immobilize' stops a disabled node.
+ANOMALY_PROFILES = {
+    "DDoS_ATTACK": {'network_latency_ms': 999.9, 'threat_level': 0.95, 'immobilize': True},
+    "POWER_FAILURE": {'network_latency_ms': 0.0, 'resource_capacity_pct': 0.0, 'threat_level': 0.9, 'immobilize': True},
+    "SIGNAL_JAMMING": {'network_latency_ms': 650.0, 'threat_level': 0.85, 'immobilize': False},
+    "RESOURCE_EXHAUSTION": {'network_latency_ms': 420.0, 'resource_capacity_pct': 4.0, 'threat_level': 0.85, 'immobilize': False},
+}
 
 class CityConnectGrid:
-    def __init__(self, num_nodes: int = 5):
+    def __init__(self, num_nodes: int = 5, threat_model: ThreatDiffusion | None = None):
         self.num_nodes = num_nodes
         self.graph = nx.complete_graph(num_nodes)
         self.grid_size = 1000.0 # 1000x1000 meter grid
+        self._baselines = {} # Pre-attack telemetry of nodes under an injected anomaly
+        self._contagion = set() # Nodes whose threat level was set by the diffusion model (and may recover)
+        self.threat_model = threat_model or ThreatDiffusion() # Contagion between radio neighbours
+        self.lock = threading.RLock() # Serializes the physics tick with externally ingested updates
+        self._edges = None # Cached edge index, see _edge_index()
         self._initialize_iot_sensors()
 
     def _initialize_iot_sensors(self):
@@ -24,35 +42,206 @@ class CityConnectGrid:
             }
         self._update_edge_distances()
 
-    def _update_edge_distances(self):
-        """Calculates exact Euclidean distance between moving nodes."""
-        for u, v in self.graph.edges:
-            x1, y1 = self.graph.nodes[u]['telemetry']['x'], self.graph.nodes[u]['telemetry']['y']
-            x2, y2 = self.graph.nodes[v]['telemetry']['x'], self.graph.nodes[v]['telemetry']['y']
-            distance = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-            self.graph.edges[u, v]['distance'] = max(1.0, distance)
-            self.graph.edges[u, v].setdefault('pheromone_level', 1.0)
-
-    def tick_physics_engine(self):
-        """Moves all nodes by their velocity vector for one second of time."""
-        for node in self.graph.nodes:
-            t = self.graph.nodes[node]['telemetry']
-            # Update position, bounce off grid walls
-            t['x'] += t['velocity_x']
-            t['y'] += t['velocity_y']
-            if t['x'] <= 0 or t['x'] >= self.grid_size: t['velocity_x'] *= -1
-            if t['y'] <= 0 or t['y'] >= self.grid_size: t['velocity_y'] *= -1
-        
-        self._update_edge_distances()
+    def _node_arrays(self):
+        """(telemetry records, x, y) in graph node order."""
+        records = [self.graph.nodes[n]['telemetry'] for n in self.graph.nodes]
+        x = np.fromiter((r['x'] for r in records), dtype=np.float64, count=len(records))
+        y = np.fromiter((r['y'] for r in records), dtype=np.float64, count=len(records))
+        return records, x, y
+
+    def _edge_index(self):
+        """
+        (u positions, v positions, edge attribute dicts) for every edge, so per-edge updates are array maths
+        plus one write per edge instead of two node lookups each. Rebuilt when edges are added or removed
+        (e.g. prune_links in the scenario engine).
+        """
+        if self._edges is None or len(self._edges[2]) != self.graph.number_of_edges():
+            position = {n: i for i, n in enumerate(self.graph.nodes)}
+            edges = list(self.graph.edges(data=True))
+            u = np.fromiter((position[a] for a, _, _ in edges), dtype=np.intp, count=len(edges))
+            v = np.fromiter((position[b] for _, b, _ in edges), dtype=np.intp, count=len(edges))
+            data = [d for _, _, d in edges]
+            for d in data:
+                d.setdefault('pheromone_level', 1.0)
+            self._edges = (u, v, data)
+        return self._edges
+
+    def _update_edge_distances(self, x: np.ndarray | None = None, y: np.ndarray | None = None):
+        """Calculates exact Euclidean distance between moving nodes (`x`/`y`: current positions in node order)."""
+        if x is None:
+            _, x, y = self._node_arrays()
+        u, v, data = self._edge_index()
+        distances = np.maximum(1.0, np.hypot(x[v] - x[u], y[v] - y[u]))
+        for d, distance in zip(data, distances.tolist()):
+            d['distance'] = distance
+
+    def tick_physics_engine(self, dt: float = 1.0):
+        """Moves all nodes by their velocity vector for `dt` seconds of time (one second by default)."""
+        records, x, y = self._node_arrays()
+        vx = np.fromiter((r['velocity_x'] for r in records), dtype=np.float64, count=len(records))
+        vy = np.fromiter((r['velocity_y'] for r in records), dtype=np.float64, count=len(records))
 
-    def inject_anomaly(self, target_node: int, anomaly_type: str):
+        # Update position, bounce off grid walls
+        x += vx * dt
+        y += vy * dt
+        vx[(x <= 0) | (x >= self.grid_size)] *= -1
+        vy[(y <= 0) | (y >= self.grid_size)] *= -1
+        # Large steps could overshoot the wall; keep nodes on the grid
+        np.clip(x, 0.0, self.grid_size, out=x)
+        np.clip(y, 0.0, self.grid_size, out=y)
+        for t, *values in zip(records, x.tolist(), y.tolist(), vx.tolist(), vy.tolist()):
+            t['x'], t['y'], t['velocity_x'], t['velocity_y'] = values
+
+        self._update_edge_distances(x, y)
+        self._propagate_threats(dt)
+
+    def _propagate_threats(self, dt: float):
+        """Spreads threat from hostile nodes to their radio neighbours (one vectorized diffusion step)."""
+        nodes = list(self.graph.nodes)
+        records = [self.graph.nodes[n]['telemetry'] for n in nodes]
+        threat = np.fromiter((r['threat_level'] for r in records), dtype=np.float64, count=len(records))
+        if not threat.any():
+            return  # Nothing hostile and nothing recovering: skip the spatial search entirely
+
+        x = np.fromiter((r['x'] for r in records), dtype=np.float64, count=len(records))
+        y = np.fromiter((r['y'] for r in records), dtype=np.float64, count=len(records))
+        # Directly attacked nodes and externally reported threat (ingestion) are pinned: they infect others but
+        # only contagion-set threat recovers on its own
+        held = np.fromiter((n in self._baselines or (threat[idx] > 0 and n not in self._contagion)
+                            for idx, n in enumerate(nodes)), dtype=bool, count=len(nodes))
+        updated = self.threat_model.step(x, y, threat, held, dt)
+
+        # Pinned nodes keep their status; everyone else is graded by the contagion level
+        for idx in np.flatnonzero(updated != threat):
+            t = records[idx]
+            t['threat_level'] = float(updated[idx])
+            t['status'] = 'COMPROMISED' if updated[idx] >= 0.8 else 'DEGRADED' if updated[idx] >= 0.3 else 'OPERATIONAL'
+            if updated[idx] > 0:
+                self._contagion.add(nodes[idx])
+            else:
+                self._contagion.discard(nodes[idx])
+
+    def inject_anomaly(self, target_node: int, anomaly_type: str, intensity: float = 1.0):
+        """
+        Drives a node's telemetry towards the anomaly profile. `intensity` in (0, 1] interpolates from the
+        node's pre-attack baseline, so repeated calls with a rising intensity model a ramping attack.
+        Partial intensities report DEGRADED; full intensity marks the node COMPROMISED.
+        """
+        if anomaly_type not in ANOMALY_PROFILES:
+            raise ValueError(f"Unknown anomaly type '{anomaly_type}'. Supported: {list(ANOMALY_PROFILES)}")
         t = self.graph.nodes[target_node]['telemetry']
-        if anomaly_type == "DDoS_ATTACK":
-            t['network_latency_ms'] = 999.9
-            t['threat_level'] = 0.95
-            t['status'] = 'COMPROMISED'
+        baseline = self._baselines.setdefault(target_node, {k: v for k, v in t.items() if k != 'status'})
+        intensity = min(1.0, max(0.0, intensity))
+
+        profile = ANOMALY_PROFILES[anomaly_type]
+        for field, target in profile.items():
+            if field != 'immobilize':
+                t[field] = baseline[field] + intensity * (target - baseline[field])
+        t['status'] = 'COMPROMISED' if intensity >= 1.0 else 'DEGRADED'
+        if profile['immobilize'] and intensity >= 1.0:
             t['velocity_x'] = 0.0 # Disabled node stops moving
             t['velocity_y'] = 0.0
 
+    def clear_anomaly(self, target_node: int):
+        """Restores a node's pre-attack telemetry (keeping its current position) and marks it OPERATIONAL."""
+        t = self.graph.nodes[target_node]['telemetry']
+        self._contagion.discard(target_node)
+        baseline = self._baselines.pop(target_node, None)
+        if baseline:
+            for field in ('network_latency_ms', 'resource_capacity_pct', 'velocity_x', 'velocity_y'):
+                t[field] = baseline[field]
+        t['threat_level'] = 0.0
+        t['status'] = 'OPERATIONAL'
+
     def fetch_live_telemetry(self) -> dict:
-        return dict(self.graph.nodes(data=True))
\ No newline at end of file
+        return dict(self.graph.nodes(data=True))
+
+    def telemetry_columns(self) -> dict:
+        """Exports the live telemetry as contiguous per-field arrays (one entry per node) instead of nested dicts."""
+        nodes = list(self.graph.nodes)
+        records = [self.graph.nodes[n]['telemetry'] for n in nodes]
+        columns = {'node_id': np.asarray(nodes, dtype=np.int32)}
+        for field in TELEMETRY_FIELDS:
+            columns[field] = np.fromiter((r[field] for r in records), dtype=np.float64, count=len(records))
+        columns['status'] = [r['status'] for r in records]
+        return columns
+
+    def apply_telemetry_columns(self, columns: dict) -> np.ndarray:
+        """
+        Bulk-applies externally reported telemetry. `columns` holds 'node_id' plus any subset of TELEMETRY_FIELDS
+        (NaN = not reported) and optionally 'status' (None = not reported). Rows are in arrival order; per node and
+        field the last reported value wins, so each node's dict is written once per batch. Unknown ids are ignored.
+        Returns the ids of the nodes that were updated.
+        """
+        ids = np.asarray(columns['node_id'], dtype=np.int64)
+        known = (ids >= 0) & (ids < self.num_nodes)
+        nodes = np.unique(ids[known])
+        if len(nodes) == 0:
+            return nodes
+
+        def last_reported(reported: np.ndarray) -> tuple:
+            """(positions in `nodes`, source rows) of each node's last row where `reported` holds."""
+            rows = np.flatnonzero(reported & known)[::-1]
+            reporting, first = np.unique(ids[rows], return_index=True)  # First in reversed order = last in arrival order
+            return np.searchsorted(nodes, reporting).tolist(), rows[first].tolist()
+
+        node_view = self.graph.nodes
+        records = [node_view[n]['telemetry'] for n in nodes.tolist()]
+        for field in TELEMETRY_FIELDS:
+            if field in columns:
+                values = np.asarray(columns[field], dtype=np.float64)
+                for pos, row in zip(*last_reported(~np.isnan(values))):
+                    records[pos][field] = float(values[row])
+                    if field == 'threat_level':
+                        self._contagion.discard(int(nodes[pos]))  # Reported threat is pinned, not decayed
+        if 'status' in columns:
+            statuses = columns['status']
+            for pos, row in zip(*last_reported(np.fromiter((bool(v) for v in statuses), dtype=bool, count=len(statuses)))):
+                records[pos]['status'] = statuses[row]
+        return nodes
+
+    def export_state(self) -> dict:
+        """
+        Full grid state as flat numpy columns: node telemetry, pre-attack baselines of attacked nodes and
+        per-edge pheromone levels learnt by the swarm router. Status is dictionary-encoded to uint8.
+        """
+        columns = self.telemetry_columns()
+        categories, codes = np.unique(np.asarray(columns['status'], dtype=str), return_inverse=True)
+        columns['status'] = codes.astype(np.uint8)
+
+        attacked = sorted(self._baselines)
+        columns['baseline_node'] = np.asarray(attacked, dtype=np.int32)
+        for field in TELEMETRY_FIELDS:
+            columns[f'baseline_{field}'] = np.fromiter((self._baselines[n][field] for n in attacked), dtype=np.float64, count=len(attacked))
+
+        columns['contagion_node'] = np.asarray(sorted(self._contagion), dtype=np.int32)
+
+        u, v, data = self._edge_index()
+        node_ids = np.asarray(list(self.graph.nodes), dtype=np.int32)
+        columns['edge_u'] = node_ids[u]
+        columns['edge_v'] = node_ids[v]
+        columns['edge_pheromone'] = np.fromiter((d['pheromone_level'] for d in data), dtype=np.float64, count=len(data))
+        return {"columns": columns, "status_categories": categories.tolist()}
+
+    def restore_state(self, columns: dict, status_categories: list):
+        """Loads a state produced by export_state (the node count must match this grid)."""
+        if len(columns['node_id']) != self.num_nodes:
+            raise ValueError(f"Snapshot holds {len(columns['node_id'])} nodes, this grid has {self.num_nodes}.")
+
+        statuses = np.asarray(status_categories)[columns['status']]
+        field_values = {field: columns[field].tolist() for field in TELEMETRY_FIELDS}
+        for idx, node in enumerate(columns['node_id'].tolist()):
+            t = self.graph.nodes[node]['telemetry']
+            for field in TELEMETRY_FIELDS:
+                t[field] = field_values[field][idx]
+            t['status'] = str(statuses[idx])
+
+        self._baselines = {
+            node: {field: float(columns[f'baseline_{field}'][idx]) for field in TELEMETRY_FIELDS}
+            for idx, node in enumerate(columns['baseline_node'].tolist())
+        }
+        self._contagion = set(columns['contagion_node'].tolist())
+
+        for u, v, level in zip(columns['edge_u'].tolist(), columns['edge_v'].tolist(), columns['edge_pheromone'].tolist()):
+            self.graph.edges[u, v]['pheromone_level'] = level
+        self._update_edge_distances()
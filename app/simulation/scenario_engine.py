@@ -0,0 +1,268 @@
+import json
+import time
+import heapq
+import random
+import argparse
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+from app.simulation.city_grid import CityConnectGrid, ANOMALY_PROFILES
+
+# Event type that restores nodes to their pre-attack telemetry
+CLEAR_EVENT = "CLEAR"
+
+# ==========================================
+# SCENARIO SCRIPTS
+# ==========================================
+# A scenario is a JSON document:
+# {
+#   "name": "cascade_burst", "seed": 7, "grid_nodes": 20, "duration_s": 120, "dt_s": 1.0,
+#   "route": {"start": 0, "target": 19},
+#   "events": [
+#     {"t": 5, "type": "DDoS_ATTACK", "nodes": [3]},
+#     {"t": 20, "type": "SIGNAL_JAMMING", "nodes": [7, 8], "ramp_s": 10},
+#     {"t": 40, "type": "POWER_FAILURE", "nodes": [11], "cascade": {"hops": 2, "delay_s": 4, "fanout": 2}},
+#     {"t": 90, "type": "CLEAR", "nodes": [3, 7, 8]}
+#   ]
+# }
+# 'ramp_s' raises the intensity linearly to 1.0 over that many seconds.
+# 'cascade' re-fires the event on the `fanout` nearest healthy neighbours of every hit node, `delay_s` later, `hops` times.
+# Optional "link_range_m" keeps only radio links up to that length (CLI), so routes relay through other nodes
+# instead of always taking the direct edge of the fully connected grid.
+
+
+def load_scenario(source) -> Dict[str, Any]:
+    """Loads and validates a scenario from a path or an already-parsed dict."""
+    if isinstance(source, dict):
+        scenario = dict(source)
+    else:
+        with open(source) as f:
+            scenario = json.load(f)
+
+    supported = set(ANOMALY_PROFILES) | {CLEAR_EVENT}
+    for i, event in enumerate(scenario.get("events", [])):
+        if event.get("type") not in supported:
+            raise ValueError(f"Scenario event {i} has unknown type '{event.get('type')}'. Supported: {sorted(supported)}")
+        if "t" not in event or not event.get("nodes"):
+            raise ValueError(f"Scenario event {i} needs a time 't' and a non-empty 'nodes' list.")
+
+    scenario.setdefault("name", "unnamed")
+    scenario.setdefault("events", [])
+    last_event = max((e["t"] + e.get("ramp_s", 0) for e in scenario["events"]), default=0)
+    scenario.setdefault("duration_s", last_event + 30)
+    return scenario
+
+
+def prune_links(grid: CityConnectGrid, link_range_m: float) -> int:
+    """Drops grid edges longer than `link_range_m` (a static mesh for the whole replay). Returns the number removed."""
+    too_long = [(u, v) for u, v, d in grid.graph.edges(data='distance') if d > link_range_m]
+    grid.graph.remove_edges_from(too_long)
+    return len(too_long)
+
+
+def _percentile_summary(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "mean": None, "p95": None, "max": None}
+    arr = np.asarray(values, dtype=np.float64)
+    return {"count": len(values), "mean": round(float(arr.mean()), 4),
+            "p95": round(float(np.percentile(arr, 95)), 4), "max": round(float(arr.max()), 4)}
+
+
+class ScenarioEngine:
+    def __init__(self, grid: CityConnectGrid, cortex, router=None, route_iterations: int = 5):
+        """
+        Replays a time-indexed attack script against a live grid and measures the detection -> routing pipeline.
+        Every tick the whole grid is scored in one cortex pass; each injected node records how long it took to be
+        flagged. The route in effect is searched once before the first event; when a detected node lies on it,
+        the router is re-run every tick and the time until the route no longer passes through any detected
+        incident node is that injection's recovery time.
+        """
+        self.grid = grid
+        self.cortex = cortex
+        self.router = router
+        self.route_iterations = route_iterations
+        self.tick_s = 1.0  # Simulated seconds per physics tick (the scenario's 'dt_s')
+
+    # ==========================================
+    # TIMELINE
+    # ==========================================
+    def _nearest_healthy(self, node: int, fanout: int, affected: set) -> List[int]:
+        """Closest neighbours by edge distance that are not already part of the incident."""
+        candidates = [(data.get('distance', float('inf')), n) for n, data in self.grid.graph[node].items() if n not in affected]
+        return [n for _, n in sorted(candidates)[:fanout]]
+
+    def _fire(self, event: Dict[str, Any], sim_t: float, timeline: list, seq: list, records: Dict[int, Dict[str, Any]], affected: set):
+        kind, nodes = event["type"], [n for n in event["nodes"] if n in self.grid.graph]
+
+        if kind == CLEAR_EVENT:
+            for node in nodes:
+                self.grid.clear_anomaly(node)
+                affected.discard(node)
+                if node in records:
+                    records[node]["cleared_at_s"] = sim_t
+            return
+
+        # Ramps count their own steps, so the intensity does not depend on where the ticks fall in time
+        ramp_s = event.get("ramp_s", 0)
+        event["ramp_step"] = event.get("ramp_step", 0) + 1
+        intensity = 1.0 if ramp_s <= 0 else min(1.0, event["ramp_step"] * self.tick_s / ramp_s)
+        for node in nodes:
+            self.grid.inject_anomaly(node, kind, intensity=intensity)
+            affected.add(node)
+            if node not in records or records[node].get("cleared_at_s") is not None:
+                records[node] = {"node_id": node, "type": kind, "injected_at_s": sim_t, "injected_wall": time.perf_counter(),
+                                 "detected_at_s": None, "detection_latency_s": None, "detection_latency_wall_s": None,
+                                 "route_affected": None, "recovered_at_s": None, "recovery_time_s": None, "cleared_at_s": None}
+
+        # Ramps re-fire themselves every tick until they reach full intensity
+        if intensity < 1.0:
+            self._schedule(timeline, seq, sim_t + self.tick_s, event)
+
+        # Cascades spread once, when the originating event first fires (ramp re-fires carry the flag)
+        cascade = event.get("cascade")
+        if cascade and cascade.get("hops", 0) > 0 and not event.get("cascaded"):
+            event["cascaded"] = True
+            spread = []
+            for node in nodes:
+                spread += [n for n in self._nearest_healthy(node, cascade.get("fanout", 1), affected | set(spread)) if n not in spread]
+            if spread:
+                child = {k: v for k, v in event.items() if k not in ("start_t", "ramp_step", "cascaded")}
+                child.update(t=sim_t + cascade.get("delay_s", self.tick_s), nodes=spread, cascade=dict(cascade, hops=cascade["hops"] - 1))
+                self._schedule(timeline, seq, child["t"], child)
+
+    def _schedule(self, timeline: list, seq: list, at: float, event: Dict[str, Any]):
+        event.setdefault("start_t", at)
+        seq[0] += 1
+        heapq.heappush(timeline, (at, seq[0], event))
+
+    # ==========================================
+    # REPLAY
+    # ==========================================
+    def run(self, scenario, speed: float = 0.0) -> Dict[str, Any]:
+        """
+        Replays `scenario` (path or dict). `speed` is simulated seconds per wall second:
+        1.0 is real time, 10.0 is ten times faster, 0 runs as fast as possible.
+        Returns the report (per-injection records plus latency summaries).
+        """
+        scenario = load_scenario(scenario)
+        if not self.cortex.is_trained:
+            raise Exception("Critical Error: ML Cortex must be trained before replaying a scenario.")
+        self.tick_s = float(scenario.get("dt_s", 1.0))
+
+        timeline, seq = [], [0]
+        for event in scenario["events"]:
+            self._schedule(timeline, seq, float(event["t"]), dict(event))
+
+        route = scenario.get("route")
+        records: Dict[int, Dict[str, Any]] = {}
+        affected: set = set()
+        history: List[Dict[str, Any]] = []
+        route_searches = 0
+
+        # The route in effect before anything happens; recovery is measured against it
+        active_path: List[int] = []
+        if route and self.router:
+            active_path = self.router.optimize_route(route["start"], route["target"], iterations=self.route_iterations)
+            route_searches += 1
+
+        # Simulated time is tick * dt from an integer counter (accumulated floats drift off the event times)
+        wall_start = time.perf_counter()
+        tick, sim_t = 0, 0.0
+        while sim_t <= scenario["duration_s"] + 1e-9:
+            while timeline and timeline[0][0] <= sim_t + 1e-9:
+                _, _, event = heapq.heappop(timeline)
+                self._fire(event, sim_t, timeline, seq, records, affected)
+
+            columns = self.grid.telemetry_columns()
+            is_anomaly, _ = self.cortex.score_columns(columns)
+            flagged = set(columns['node_id'][is_anomaly].tolist())
+            now_wall = time.perf_counter()
+
+            for node, rec in records.items():
+                if rec["detected_at_s"] is None and rec["cleared_at_s"] is None and node in flagged:
+                    rec["detected_at_s"] = sim_t
+                    rec["detection_latency_s"] = sim_t - rec["injected_at_s"]
+                    rec["detection_latency_wall_s"] = round(now_wall - rec["injected_wall"], 6)
+                    # Only a node relaying the active route disrupts it (route endpoints cannot be routed around)
+                    rec["route_affected"] = node in active_path[1:-1]
+
+            # Recovery: the router is re-run until the route in effect avoids every detected, uncleared incident node
+            awaiting = [r for r in records.values() if r["route_affected"] and r["recovered_at_s"] is None and r["cleared_at_s"] is None]
+            if route and self.router and awaiting:
+                path = self.router.optimize_route(route["start"], route["target"], iterations=self.route_iterations)
+                route_searches += 1
+                if path:
+                    active_path = path
+                incident = {r["node_id"] for r in records.values() if r["detected_at_s"] is not None and r["cleared_at_s"] is None}
+                if path and not incident.intersection(active_path[1:-1]):
+                    for rec in awaiting:
+                        rec["recovered_at_s"] = sim_t
+                        rec["recovery_time_s"] = round(sim_t - rec["detected_at_s"], 6)
+
+            history.append({"t": sim_t, "flagged": len(flagged), "affected": len(affected)})
+            self.grid.tick_physics_engine(self.tick_s)
+            tick += 1
+            sim_t = round(tick * self.tick_s, 9)
+
+            if speed > 0:
+                lag = wall_start + sim_t / speed - time.perf_counter()
+                if lag > 0:
+                    time.sleep(lag)
+
+        injections = [{k: v for k, v in r.items() if k != "injected_wall"} for r in records.values()]
+        detected = [r for r in injections if r["detection_latency_s"] is not None]
+        return {
+            "scenario": scenario["name"],
+            "speed": speed,
+            "simulated_s": sim_t,
+            "wall_s": round(time.perf_counter() - wall_start, 4),
+            "route_searches": route_searches,
+            "summary": {
+                "injections": len(injections),
+                "missed_detections": len(injections) - len(detected),
+                "route_disruptions": sum(1 for r in injections if r["route_affected"]),
+                "detection_latency_s": _percentile_summary([r["detection_latency_s"] for r in detected]),
+                "detection_latency_wall_s": _percentile_summary([r["detection_latency_wall_s"] for r in detected]),
+                "recovery_time_s": _percentile_summary([r["recovery_time_s"] for r in injections if r["recovery_time_s"] is not None])
+            },
+            "injections": injections,
+            "timeline": history
+        }
+
+
+# --- Quick Lab Test / CLI ---
+if __name__ == "__main__":
+    from app.ml.predictive_cortex import PredictiveCortex
+    from app.swarm.aco_router import SwarmRouter
+
+    parser = argparse.ArgumentParser(description="Replay an attack scenario against a City-Omega grid.")
+    parser.add_argument("scenario", help="Path to the scenario JSON script")
+    parser.add_argument("--speed", type=float, default=0.0, help="Simulated seconds per wall second (0 = as fast as possible)")
+    parser.add_argument("--report", default=None, help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    script = load_scenario(args.scenario)
+    random.seed(script.get("seed"))
+    grid_env = CityConnectGrid(num_nodes=script.get("grid_nodes", 20))
+    if script.get("link_range_m"):
+        print(f"[SCENARIO] Mesh links up to {script['link_range_m']}m ({prune_links(grid_env, script['link_range_m'])} long links dropped).")
+    cortex = PredictiveCortex()
+    cortex.train_baseline()
+    router = SwarmRouter(graph=grid_env.graph, verbose=False)
+
+    print(f"\n[SCENARIO] Replaying '{script['name']}' ({len(script['events'])} scripted events, {script['duration_s']}s simulated)...")
+    report = ScenarioEngine(grid_env, cortex, router).run(script, speed=args.speed)
+
+    report_path = args.report or f"scenario_report_{script['name']}.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    summary = report["summary"]
+    print("\n==============================================")
+    print("SCENARIO REPLAY REPORT")
+    print("==============================================")
+    print(f"Injections: {summary['injections']} (missed: {summary['missed_detections']})")
+    print(f"Detection latency (sim s): {summary['detection_latency_s']}")
+    print(f"Route disruptions: {summary['route_disruptions']}")
+    print(f"Router recovery (sim s):   {summary['recovery_time_s']}")
+    print(f"Wall time: {report['wall_s']}s -> {report_path}")
@@ -3,18 +3,20 @@ import networkx as nx
 from typing import List
 
 class SwarmRouter:
-    def __init__(self, graph: nx.Graph, num_ants: int = 20, decay_rate: float = 0.1, alpha: float = 1.0, beta: float = 2.0):
+    def __init__(self, graph: nx.Graph, num_ants: int = 20, decay_rate: float = 0.1, alpha: float = 1.0, beta: float = 2.0, verbose: bool = True):
         """
         Ant Colony Optimization (ACO) engine for routing physical assets through the IoT grid.
         - alpha: Importance of the pheromone trail.
         - beta: Importance of the heuristic (visibility/distance).
         - decay_rate: How fast pheromones evaporate over time.
+        - verbose: Announce each deployment (disable for load tests that route every tick).
         """
         self.graph = graph
         self.num_ants = num_ants
         self.decay_rate = decay_rate
         self.alpha = alpha
         self.beta = beta
+        self.verbose = verbose
 
     def _calculate_transition_probability(self, current_node: int, available_neighbors: List[int]) -> int:
         """The core Swarm math: Decides which node an asset should move to next."""
@@ -53,7 +55,8 @@ class SwarmRouter:
         best_route = []
         best_distance = float('inf')
 
-        print(f"\n[SWARM] Deploying {self.num_ants} micro-agents to find optimal route from Node {start_node} to Node {target_node}...")
+        if self.verbose:
+            print(f"\n[SWARM] Deploying {self.num_ants} micro-agents to find optimal route from Node {start_node} to Node {target_node}...")
 
         for _ in range(iterations):
             for ant in range(self.num_ants):
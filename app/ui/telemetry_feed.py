@@ -0,0 +1,68 @@
+import time
+import threading
+import httpx
+
+from app.core.telemetry_frame import FRAME_MEDIA_TYPE, decode_telemetry_frame
+
+
+class StaleTelemetryError(ConnectionError):
+    """The last poll failed after a good frame: `age_s` is how old the last good frame is."""
+    def __init__(self, error: Exception, age_s: float):
+        super().__init__(f"Telemetry feed stale for {age_s:.1f}s: {error}")
+        self.error = error
+        self.age_s = age_s
+
+
+class TelemetryFeed:
+    def __init__(self, client: httpx.Client, interval_s: float = 0.5):
+        """
+        Single background subscription to /telemetry shared by every dashboard widget and session.
+        One poller pulls the columnar frame on the engine's tick cadence; readers just take the latest snapshot.
+        """
+        self.client = client
+        self.interval_s = interval_s
+        self._snapshot = None
+        self._snapshot_at = 0.0  # Monotonic time of the last good frame
+        self._error = None
+        self._lock = threading.Lock()
+        self._fresh = threading.Condition(self._lock)
+        self._thread = threading.Thread(target=self._run, name="omega-telemetry-feed", daemon=True)
+        self._thread.start()
+
+    def _fetch(self):
+        response = self.client.get("/telemetry", headers={"Accept": FRAME_MEDIA_TYPE})
+        response.raise_for_status()
+        snapshot = decode_telemetry_frame(response.content)
+        with self._lock:
+            self._snapshot, self._snapshot_at, self._error = snapshot, time.monotonic(), None
+            self._fresh.notify_all()
+        return snapshot
+
+    def _run(self):
+        while True:
+            try:
+                self._fetch()
+            except Exception as e:
+                with self._lock:
+                    self._error = e
+                    self._fresh.notify_all()
+            time.sleep(self.interval_s)
+
+    def latest(self, wait_s: float = 5.0):
+        """
+        Returns (telemetry DataFrame, meta), waiting briefly for the very first frame after startup.
+        Raises ConnectionError while no frame has arrived, and StaleTelemetryError when the most recent poll
+        failed (a successful poll clears the error), so a dead backend is never shown as live.
+        """
+        with self._lock:
+            if self._snapshot is None and self._error is None:
+                self._fresh.wait(timeout=wait_s)
+            if self._snapshot is None:
+                raise ConnectionError(f"Telemetry feed unavailable: {self._error}")
+            if self._error is not None:
+                raise StaleTelemetryError(self._error, time.monotonic() - self._snapshot_at)
+            return self._snapshot
+
+    def refresh(self):
+        """Pulls a frame immediately (e.g. right after a command changed server state)."""
+        return self._fetch()
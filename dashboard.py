@@ -2,17 +2,29 @@ import streamlit as st
 import pydeck as pdk
 import pandas as pd
 import httpx
-import asyncio
 import time
 import plotly.express as px
 
+from app.ui.telemetry_feed import TelemetryFeed, StaleTelemetryError
+
 API_URL = "http://127.0.0.1:8000"
+LARGE_GRID_NODES = 2000 # Above this, charts switch to server-side aggregates
+
+@st.cache_resource
+def get_client():
+    """One keep-alive, connection-pooled HTTP client reused across reruns and sessions."""
+    return httpx.Client(base_url=API_URL, timeout=60, limits=httpx.Limits(max_connections=20, max_keepalive_connections=10))
+
+@st.cache_resource
+def get_telemetry_feed():
+    """Single background /telemetry subscription shared by every widget instead of a full fetch per rerun."""
+    return TelemetryFeed(get_client())
 
-async def api_call(path, method="GET"):
-    """Handles asynchronous communication with the FastAPI Distributed Backend."""
-    async with httpx.AsyncClient(timeout=60) as client:
-        if method == "GET": return (await client.get(f"{API_URL}{path}")).json()
-        return (await client.post(f"{API_URL}{path}")).json()
+def api_call(path, method="GET"):
+    """Handles communication with the FastAPI Distributed Backend over the shared client."""
+    client = get_client()
+    if method == "GET": return client.get(path).json()
+    return client.post(path).json()
 
 # ---------------------------------------------------------
 # 1. PAGE CONFIG & ELITE TACTICAL CSS
@@ -58,8 +70,11 @@ st.title("🛡️ City Connect Omega | Prime Command Center")
 # 2. DATA SYNCHRONIZATION
 # ---------------------------------------------------------
 try:
-    data = asyncio.run(api_call("/telemetry"))
-    telemetry, alerts, system = data['telemetry'], data['alerts'], data['system']
+    telemetry_df, meta = get_telemetry_feed().latest()
+    alerts, system = meta['alerts'], meta['system']
+except StaleTelemetryError as e:
+    st.error(f"🚨 CRITICAL: Distributed Backend Offline. Last telemetry frame is {e.age_s:.0f}s old; live view paused.")
+    st.stop()
 except Exception as e:
     st.error("🚨 CRITICAL: Distributed Backend Offline. Run `uvicorn app.api_server:app --reload`")
     st.stop()
@@ -79,40 +94,57 @@ st.divider()
 # 4. MAIN TACTICAL INTERFACE
 # ---------------------------------------------------------
 col_map, col_tac = st.columns([2, 1])
+large_grid = len(telemetry_df) > LARGE_GRID_NODES
 
 with col_map:
     st.subheader("🌐 3D Digital Twin | Spatial Asset Mapping")
-    nodes_df = []
-    for n, d in telemetry.items():
-        t = d['telemetry']
-        # COLOR LOGIC: Crimson Red for compromised, Neon Cyan for safe
-        color = [255, 51, 102, 220] if t['status'] == 'COMPROMISED' else [0, 255, 204, 180]
-        
-        nodes_df.append({
-            "name": f"IoT Node [{n}]",
-            "lon": 5.0 + (t['x'] / 1000), 
-            "lat": 6.5 + (t['y'] / 1000), 
-            "color": color,
-            "status": t['status']
-        })
-    
     # 3D View Angle
     view_state = pdk.ViewState(latitude=6.5, longitude=5.5, zoom=6.5, pitch=50, bearing=15)
-    
-    st.pydeck_chart(pdk.Deck(
-        map_style="mapbox://styles/mapbox/dark-v10",
-        initial_view_state=view_state,
-        layers=[pdk.Layer(
+
+    if large_grid:
+        # Past a few thousand assets, render server-binned tiles instead of one point per node
+        tiles = pd.DataFrame(api_call("/analytics/heatmap?tile_m=50"))
+        tiles["lon"] = 5.0 + tiles["x_center"] / 1000
+        tiles["lat"] = 6.5 + tiles["y_center"] / 1000
+        tiles["color"] = [[255, 51, 102, 220] if c else [0, 255, 204, 180] for c in tiles["compromised"] > 0]
+        layer = pdk.Layer(
+            "ColumnLayer",
+            tiles,
+            get_position="[lon, lat]",
+            get_elevation="count",
+            elevation_scale=400,
+            radius=2000,
+            get_fill_color="color",
+            pickable=True
+        )
+        tooltip = {"text": "{count} nodes | {compromised} compromised\nMean latency: {latency_mean_ms} ms"}
+    else:
+        compromised = (telemetry_df['status'] == 'COMPROMISED').to_numpy()
+        nodes_df = pd.DataFrame({
+            "name": "IoT Node [" + telemetry_df['node_id'].astype(str) + "]",
+            "lon": 5.0 + telemetry_df['x'] / 1000,
+            "lat": 6.5 + telemetry_df['y'] / 1000,
+            # COLOR LOGIC: Crimson Red for compromised, Neon Cyan for safe
+            "color": [[255, 51, 102, 220] if c else [0, 255, 204, 180] for c in compromised],
+            "status": telemetry_df['status'].astype(str)
+        })
+        layer = pdk.Layer(
             "ScatterplotLayer", 
-            pd.DataFrame(nodes_df), 
+            nodes_df, 
             get_position="[lon, lat]", 
             get_color="color", 
             get_radius=3500, 
             pickable=True,
             stroked=True,
             line_width_min_pixels=2
-        )],
-        tooltip={"text": "{name}\nStatus: {status}"}
+        )
+        tooltip = {"text": "{name}\nStatus: {status}"}
+    
+    st.pydeck_chart(pdk.Deck(
+        map_style="mapbox://styles/mapbox/dark-v10",
+        initial_view_state=view_state,
+        layers=[layer],
+        tooltip=tooltip
     ))
 
 with col_tac:
@@ -120,9 +152,9 @@ with col_tac:
     
     # Attack Injection
     if st.button("🚀 INJECT ZERO-DAY ATTACK", use_container_width=True):
-        asyncio.run(api_call("/trigger-random-attack", "POST"))
+        api_call("/trigger-random-attack", "POST")
         st.toast("⚠️ ADVERSARIAL VECTOR INJECTED", icon="🚨")
-        time.sleep(0.5)
+        get_telemetry_feed().refresh()
         st.rerun()
 
     st.divider()
@@ -135,13 +167,17 @@ with col_tac:
         
         if system["ai_status"] == "IDLE":
             if st.button("🧠 ACTIVATE Llama-3.3 ORACLE", type="primary", use_container_width=True):
-                asyncio.run(api_call("/process-intelligence", "POST"))
+                api_call("/process-intelligence", "POST")
+                get_telemetry_feed().refresh()
                 st.rerun()
 
     if system["ai_status"] == "THINKING":
         st.info("🧠 Interrogating Vector Memory Cortex...")
-        st.spinner()
-        time.sleep(2)
+        # Long-poll: the server answers the moment the analysis job finishes (or after 25s with no change)
+        with st.spinner("Awaiting Oracle analysis..."):
+            if system.get("active_job_id"):
+                api_call(f"/jobs/{system['active_job_id']}/wait?timeout_s=25")
+        get_telemetry_feed().refresh()
         st.rerun()
 
     if system["ai_status"] == "AWAITING_AUTHORIZATION":
@@ -160,7 +196,7 @@ with col_tac:
             st.toast("🛡️ ACTION APPROVED: Grid Secured & Memory Learned.", icon="✅")
             st.balloons() # Adds a subtle visual confirmation layer
             # 2. Hit the API
-            asyncio.run(api_call("/decide/YES", "POST"))
+            api_call("/decide/YES", "POST")
             # 3. Wait for human to see the popup before resetting the UI
             time.sleep(1.8)
             st.rerun()
@@ -169,11 +205,30 @@ with col_tac:
             # 1. Trigger the visual popup
             st.toast("🛑 ACTION VETOED: Status Quo Maintained.", icon="❌")
             # 2. Hit the API
-            asyncio.run(api_call("/decide/NO", "POST"))
+            api_call("/decide/NO", "POST")
             # 3. Wait for human to see the popup before resetting the UI
             time.sleep(1.5)
             st.rerun()
 
+    # ---------------------------------------------------------
+    # 5b. PARKED AGENT ACTIONS (ASYNC VETO QUEUE)
+    # ---------------------------------------------------------
+    pending_approvals = api_call("/approvals")["pending"]
+    if pending_approvals:
+        st.divider()
+        st.subheader(f"⚖️ Pending Authorizations ({len(pending_approvals)})")
+        for approval in pending_approvals:
+            remaining = max(0, int(approval["deadline"] - time.time()))
+            st.warning(f"**{approval['action']}** on Node {approval['params'].get('target_node')} "
+                       f"by {approval['agent']} | {approval['reason']} | auto-decides in {remaining}s")
+            a1, a2 = st.columns(2)
+            if a1.button("✅ AUTHORIZE", key=f"approve_{approval['id']}", use_container_width=True):
+                api_call(f"/approvals/{approval['id']}/YES", "POST")
+                st.rerun()
+            if a2.button("❌ VETO", key=f"veto_{approval['id']}", use_container_width=True):
+                api_call(f"/approvals/{approval['id']}/NO", "POST")
+                st.rerun()
+
 # ---------------------------------------------------------
 # 6. DATA LAKE & SCIENTIFIC ANALYTICS
 # ---------------------------------------------------------
@@ -181,20 +236,52 @@ st.divider()
 tab1, tab2, tab3 = st.tabs(["📊 Live Telemetry Stream", "📈 Mathematical Latency Profiling", "📜 Immutable Mission Logs"])
 
 with tab1:
-    df_tele = []
-    for n, d in telemetry.items():
-        t = d['telemetry']
-        df_tele.append({"Node ID": n, "State": t['status'], "Latency (ms)": round(t['network_latency_ms'], 2), 
-                        "Capacity (%)": round(t['resource_capacity_pct'], 1), "Threat Level": t['threat_level']})
-    st.dataframe(pd.DataFrame(df_tele), use_container_width=True)
+    # Paginated and sorted on the server; only one page of rows crosses the wire
+    sort_labels = {"Threat Level": "threat_level", "Latency (ms)": "network_latency_ms",
+                   "Capacity (%)": "resource_capacity_pct", "Anomaly Score": "anomaly_score", "Node ID": "node_id"}
+    s1, s2, s3 = st.columns(3)
+    sort_by = sort_labels[s1.selectbox("Sort by", list(sort_labels))]
+    descending = s2.toggle("Descending", value=True)
+    page = s3.number_input("Page", min_value=0, value=0, step=1)
+    node_table = api_call(f"/analytics/nodes?page={page}&page_size=50&sort_by={sort_by}&descending={str(descending).lower()}")
+    rows = pd.DataFrame(node_table.get("rows", {}))
+    if not rows.empty:
+        df_tele = pd.DataFrame({
+            "Node ID": rows['node_id'],
+            "State": rows['status'],
+            "Latency (ms)": rows['network_latency_ms'].round(2),
+            "Capacity (%)": rows['resource_capacity_pct'].round(1),
+            "Threat Level": rows['threat_level']
+        })
+        st.caption(f"{node_table['total']} nodes | page {page} of {max(0, (node_table['total'] - 1) // 50)}")
+        st.dataframe(df_tele, use_container_width=True)
+    else:
+        st.caption(node_table.get("detail", "No nodes on this page."))
 
 with tab2:
-    latencies = [d['telemetry']['network_latency_ms'] for d in telemetry.values()]
-    fig = px.area(x=list(telemetry.keys()), y=latencies, labels={'x':'Node Asset ID', 'y':'Latency (ms)'}, 
-                  title="Real-time Network Kinematics", color_discrete_sequence=['#00ffcc'])
+    if large_grid:
+        quantiles = pd.DataFrame(api_call("/analytics/latency-quantiles?region_m=250"))
+        quantiles["Region"] = quantiles["region"].astype(str)
+        fig = px.bar(quantiles, x="Region", y=["p50", "p90", "p99"], barmode="group",
+                     labels={'value': 'Latency (ms)'}, title="Regional Latency Quantiles (250 m regions)")
+    else:
+        fig = px.area(x=telemetry_df['node_id'], y=telemetry_df['network_latency_ms'], labels={'x':'Node Asset ID', 'y':'Latency (ms)'}, 
+                      title="Real-time Network Kinematics", color_discrete_sequence=['#00ffcc'])
     fig.update_layout(plot_bgcolor='#0b0e14', paper_bgcolor='#0b0e14', font_color='#e2e8f0')
     st.plotly_chart(fig, use_container_width=True)
 
+    # Historical profile from the rollup store (coarser tiers kick in for longer windows)
+    windows = {"15 min @ 1s": (900, 1), "6 h @ 1m": (21600, 60), "7 days @ 1h": (604800, 3600)}
+    window_s, resolution_s = windows[st.selectbox("History window", list(windows))]
+    history = api_call(f"/telemetry/history?window_s={window_s}&resolution_s={resolution_s}")
+    hist_df = pd.DataFrame(history["series"])
+    if not hist_df.empty:
+        hist_df["time"] = pd.to_datetime(hist_df["timestamp"], unit="s")
+        hist_fig = px.line(hist_df, x="time", y="network_latency_ms_mean", color="node_id",
+                           title=f"Latency History (tier: {history['tier']}, mean per bucket)")
+        hist_fig.update_layout(plot_bgcolor='#0b0e14', paper_bgcolor='#0b0e14', font_color='#e2e8f0')
+        st.plotly_chart(hist_fig, use_container_width=True)
+
 with tab3:
     st.markdown("### 📝 Core Architecture Logs")
     
@@ -3,9 +3,23 @@
 echo "🚀 KILLING OLD PROCESSES..."
 fuser -k 8000/tcp 2>/dev/null
 fuser -k 8501/tcp 2>/dev/null
+fuser -k 7700/tcp 2>/dev/null
 
-echo "🧠 STARTING BACKEND (API & ML)..."
-uvicorn api_server:app --port 8000 > backend.log 2>&1 &
+if [ "${OMEGA_API_WORKERS:-1}" -gt 1 ]; then
+    # Fresh secret for the engine command channel, shared by the engine host and its workers
+    if [ -z "${OMEGA_ENGINE_AUTHKEY}" ]; then
+        export OMEGA_ENGINE_AUTHKEY="$(python -c 'import secrets; print(secrets.token_hex(32))')"
+    fi
+    # One engine owns the simulation; stateless workers read its shared-memory snapshots
+    echo "🧠 STARTING ENGINE HOST (SIMULATION & ML)..."
+    python -m app.core.engine_host > engine.log 2>&1 &
+    sleep 3
+    echo "🌐 STARTING ${OMEGA_API_WORKERS} API WORKERS..."
+    uvicorn api_worker:app --port 8000 --workers "${OMEGA_API_WORKERS}" > backend.log 2>&1 &
+else
+    echo "🧠 STARTING BACKEND (API & ML)..."
+    uvicorn api_server:app --port 8000 > backend.log 2>&1 &
+fi
 
 echo "🖥️  STARTING FRONTEND (DASHBOARD)..."
 streamlit run dashboard.py --server.port 8501
\ No newline at end of file
@@ -1,6 +1,6 @@
 import time
 from app.simulation.city_grid import CityConnectGrid
-from app.agents.oracle_agent import run_oracle_diagnosis, create_oracle_agent
+from app.agents.oracle_agent import run_oracle_diagnosis, create_oracle_agent, attach_grid
 from app.agents.executive_agent import create_executive_agent
 from app.swarm.aco_router import SwarmRouter
 from crewai import Task, Crew, Process
@@ -13,6 +13,7 @@ def boot_city_connect_omega():
     
     # 1. Boot up the physical IoT grid
     grid_env = CityConnectGrid(num_nodes=5)
+    attach_grid(grid_env)
     print("[SYSTEM] IoT Grid Online. 5 Critical Nodes Connected.")
     time.sleep(1)
 
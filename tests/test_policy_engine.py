@@ -0,0 +1,23 @@
+from app.core.policy_engine import INVALID_FIELD
+from app.core.veto_protocol import VetoProtocol
+
+
+def test_unparseable_cost_fails_closed():
+    veto = VetoProtocol()
+    safe, string_cost, absent = veto.evaluate_batch([
+        {"action": "ISOLATE_NODE", "target_node": 3, "estimated_cost": 100},
+        {"action": "ISOLATE_NODE", "target_node": 3, "estimated_cost": "$8,000"},
+        {"action": "ISOLATE_NODE", "target_node": 3},
+    ])
+    assert not safe["requires_veto"]
+    assert string_cost["requires_veto"]
+    assert string_cost["reason_code"] == INVALID_FIELD
+    assert "estimated_cost" in string_cost["reason"]
+    # A truly absent field only skips its rule
+    assert not absent["requires_veto"]
+
+
+def test_numeric_strings_are_still_compared():
+    decision = VetoProtocol().engine.evaluate({"action": "ISOLATE_NODE", "target_node": 3, "estimated_cost": "8000"})
+    assert decision["reason_code"] == "SPEND_LIMIT"
+    assert VetoProtocol().engine.evaluate_matrix([{"action": "X", "target_node": "node-7"}]).any()
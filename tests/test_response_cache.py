@@ -0,0 +1,72 @@
+import pytest
+
+from app.agents.response_cache import AgentResponseCache, canonical_signature
+
+
+def telemetry(latency: float, capacity: float = 92.0, threat: float = 0.95, status: str = "COMPROMISED") -> dict:
+    """Grid dump with one anomalous node (2) and one healthy node (0)."""
+    return {
+        0: {"telemetry": {"status": "OPERATIONAL", "network_latency_ms": 31.0, "resource_capacity_pct": 97.0, "threat_level": 0.0}},
+        2: {"telemetry": {"status": status, "network_latency_ms": latency, "resource_capacity_pct": capacity, "threat_level": threat}},
+    }
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AgentResponseCache(path=str(tmp_path / "responses.json"), ttl_s=60.0)
+
+
+def test_near_identical_incident_is_a_cache_hit(cache):
+    calls = []
+    first_key = canonical_signature(telemetry(999.9), scope="oracle_brief")
+    repeat_key = canonical_signature(telemetry(1001.2, capacity=91.0, threat=0.951), scope="oracle_brief")
+
+    value, cached = cache.get_or_compute(first_key, lambda: calls.append(1) or "brief")
+    assert (value, cached) == ("brief", False)
+
+    value, cached = cache.get_or_compute(repeat_key, lambda: calls.append(1) or "recomputed")
+    assert (value, cached) == ("brief", True)
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize("changed", [
+    {"latency": 650.0},
+    {"latency": 999.9, "status": "DEGRADED"},
+    {"latency": 999.9, "threat": 0.5},
+])
+def test_different_incident_is_a_cache_miss(cache, changed):
+    cache.put(canonical_signature(telemetry(999.9), scope="oracle_brief"), "brief")
+
+    assert cache.get(canonical_signature(telemetry(**changed), scope="oracle_brief")) is None
+    assert cache.misses == 1
+
+
+def test_scopes_and_healthy_nodes(cache):
+    incident = telemetry(999.9)
+    assert canonical_signature(incident, scope="oracle_brief") != canonical_signature(incident, scope="incident_response")
+
+    # Healthy nodes do not take part in the signature
+    noisy = {**incident, 0: {"telemetry": dict(incident[0]["telemetry"], network_latency_ms=48.0)}}
+    assert canonical_signature(noisy, scope="oracle_brief") == canonical_signature(incident, scope="oracle_brief")
+
+
+def test_entries_expire_and_persist(tmp_path):
+    path = str(tmp_path / "responses.json")
+    key = canonical_signature(telemetry(999.9), scope="oracle_brief")
+
+    AgentResponseCache(path=path, ttl_s=60.0).put(key, {"summary": "brief", "actions": []})
+    assert AgentResponseCache(path=path).get(key) == {"summary": "brief", "actions": []}
+
+    expired = AgentResponseCache(path=path, ttl_s=0.0)
+    expired.put(key, "stale")
+    assert expired.get(key) is None
+
+
+def test_stub_llm_returns_a_final_answer():
+    pytest.importorskip("crewai")
+    from app.agents.llm_factory import StubLLM
+
+    answer = StubLLM(temperature=0.1).call([{"role": "user", "content": "Node 2: status=COMPROMISED"}])
+    assert "Final Answer:" in answer
+    assert "Recommended Countermeasure" in answer
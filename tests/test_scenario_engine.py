@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from app.ml.predictive_cortex import PredictiveCortex
+from app.simulation.city_grid import CityConnectGrid
+from app.simulation.scenario_engine import ScenarioEngine
+from app.swarm.aco_router import SwarmRouter
+
+
+@pytest.fixture(scope="module")
+def cortex():
+    random.seed(11)
+    model = PredictiveCortex()
+    model.train_baseline()
+    return model
+
+
+def ladder_grid() -> CityConnectGrid:
+    """Static 6-node mesh: a short relay 0-1-2-5 and a longer detour 0-3-4-5."""
+    grid = CityConnectGrid(num_nodes=6)
+    positions = {0: (100, 500), 1: (400, 500), 2: (700, 500), 5: (900, 500), 3: (400, 800), 4: (700, 800)}
+    for node, (x, y) in positions.items():
+        grid.graph.nodes[node]['telemetry'].update(x=x, y=y, velocity_x=0.0, velocity_y=0.0)
+    grid.graph.remove_edges_from(list(grid.graph.edges))
+    grid.graph.add_edges_from([(0, 1), (1, 2), (2, 5), (0, 3), (3, 4), (4, 5)])
+    grid.tick_physics_engine(0.0)  # Refresh edge distances for the new links
+    return grid
+
+
+def test_ramped_attack_on_relay_node_has_nonzero_recovery(cortex):
+    random.seed(3)
+    grid = ladder_grid()
+    router = SwarmRouter(grid.graph, verbose=False)
+    scenario = {
+        "name": "relay_ramp", "duration_s": 30, "route": {"start": 0, "target": 5},
+        "events": [{"t": 2, "type": "SIGNAL_JAMMING", "nodes": [1], "ramp_s": 10}]
+    }
+
+    report = ScenarioEngine(grid, cortex, router, route_iterations=10).run(scenario)
+    record = report["injections"][0]
+
+    assert record["route_affected"] is True
+    # The partially jammed relay is flagged before its threat makes ants avoid it
+    assert record["recovery_time_s"] > 0
+    assert report["summary"]["route_disruptions"] == 1
+
+
+def test_attack_off_the_route_is_not_a_disruption(cortex):
+    random.seed(3)
+    grid = ladder_grid()
+    router = SwarmRouter(grid.graph, verbose=False)
+    scenario = {"name": "off_route", "duration_s": 10, "route": {"start": 0, "target": 5},
+                "events": [{"t": 2, "type": "DDoS_ATTACK", "nodes": [4]}]}
+
+    record = ScenarioEngine(grid, cortex, router).run(scenario)["injections"][0]
+
+    assert record["detected_at_s"] is not None
+    assert record["route_affected"] is False
+    assert record["recovery_time_s"] is None
+
+
+@pytest.mark.parametrize("dt_s", [1.0, 2.0, 0.3])
+def test_cascades_fire_regardless_of_tick_size(cortex, dt_s):
+    random.seed(7)
+    grid = CityConnectGrid(num_nodes=12)
+    scenario = {
+        "name": "cascade", "duration_s": 20, "dt_s": dt_s,
+        "events": [{"t": 5, "type": "POWER_FAILURE", "nodes": [0], "cascade": {"hops": 2, "delay_s": 3, "fanout": 2}}]
+    }
+
+    report = ScenarioEngine(grid, cortex).run(scenario)
+
+    assert report["summary"]["injections"] == 1 + 2 + 4